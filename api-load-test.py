@@ -0,0 +1,113 @@
+"""
+Load test for api_server.py.
+
+Opens keep-alive connections to a running API server, sends the same request
+from every connection as fast as possible and reports throughput and latency
+percentiles. Example:
+
+    python api_server.py --port 8080 &
+    python api-load-test.py --port 8080 --endpoint /encrypt --connections 32 --requests 20000
+"""
+import argparse
+import asyncio
+import json
+import time
+
+DEFAULT_BODIES = {
+    "/encrypt": {"text": "ATTACKATDAWN" * 10, "key": "LEMON"},
+    "/decrypt": {"text": "LXFOPVEFRNHR" * 10, "key": "LEMON"},
+    "/analyze": {"ciphertext": "LXFOPVEFRNHR" * 20, "max_length": 15},
+    "/break": {"ciphertext": "LXFOPVEFRNHR" * 20, "key_length": 5},
+}
+
+async def worker(host, port, request, count, latencies, failures):
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        for _ in range(count):
+            start = time.perf_counter()
+            writer.write(request)
+            await writer.drain()
+
+            head = await reader.readuntil(b"\r\n\r\n")
+            status = int(head.split(b" ", 2)[1])
+            length = 0
+            for line in head.split(b"\r\n"):
+                if line.lower().startswith(b"content-length:"):
+                    length = int(line.split(b":", 1)[1])
+            await reader.readexactly(length)
+
+            latencies.append(time.perf_counter() - start)
+            if status != 200:
+                failures.append(status)
+    finally:
+        writer.close()
+
+def build_request(host, method, endpoint, body):
+    payload = json.dumps(body).encode("utf-8") if body is not None else b""
+    head = (
+        f"{method} {endpoint} HTTP/1.1\r\n"
+        f"Host: {host}\r\n"
+        "Content-Type: application/json\r\n"
+        f"Content-Length: {len(payload)}\r\n"
+        "\r\n"
+    ).encode("latin-1")
+    return head + payload
+
+def percentile(sorted_samples, q):
+    index = min(len(sorted_samples) - 1, int(q * len(sorted_samples)))
+    return sorted_samples[index]
+
+async def run(args):
+    if args.body:
+        body = json.loads(args.body)
+    else:
+        body = DEFAULT_BODIES.get(args.endpoint)
+    method = "POST" if body is not None else "GET"
+    request = build_request(args.host, method, args.endpoint, body)
+
+    per_connection = max(1, args.requests // args.connections)
+    latencies, failures = [], []
+
+    start = time.perf_counter()
+    await asyncio.gather(*(
+        worker(args.host, args.port, request, per_connection, latencies, failures)
+        for _ in range(args.connections)
+    ))
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        "endpoint": args.endpoint,
+        "connections": args.connections,
+        "requests": len(latencies),
+        "failures": len(failures),
+        "seconds": elapsed,
+        "requests_per_second": len(latencies) / elapsed,
+        "p50_ms": percentile(latencies, 0.50) * 1000,
+        "p99_ms": percentile(latencies, 0.99) * 1000,
+        "max_ms": latencies[-1] * 1000,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure throughput and latency of api_server.py.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--endpoint", default="/encrypt")
+    parser.add_argument("--body", help="JSON request body (defaults to a sample for the endpoint)")
+    parser.add_argument("--connections", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=10000, help="Total number of requests")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args()
+
+    report = asyncio.run(run(args))
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print(f"{report['requests']} requests to {report['endpoint']} over {report['connections']} connections "
+              f"in {report['seconds']:.2f}s ({report['failures']} failed)")
+        print(f"Throughput: {report['requests_per_second']:.0f} req/s")
+        print(f"Latency p50: {report['p50_ms']:.2f} ms, p99: {report['p99_ms']:.2f} ms, max: {report['max_ms']:.2f} ms")
+
+if __name__ == "__main__":
+    main()
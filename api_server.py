@@ -0,0 +1,300 @@
+"""
+Headless JSON/HTTP API for the Vigenère tools.
+
+Run with ``python api_server.py --port 8080``. Every endpoint takes and
+returns JSON:
+
+    POST /encrypt   {"text": "...", "key": "..."}        -> {"result": "..."}
+    POST /decrypt   {"text": "...", "key": "..."}        -> {"result": "..."}
+    POST /analyze   {"ciphertext": "...", "max_length": 20}
+                                                         -> {"key_lengths": {"1": 0.04, ...}}
+    POST /break     {"ciphertext": "...", "key_length": 5}
+                                                         -> {"plaintext": "...", "key": "..."}
+    POST /batch     {"requests": [{"op": "encrypt", ...}, ...]}
+                                                         -> {"results": [...]}
+    GET  /health                                         -> {"status": "ok"}
+    GET  /metrics                                        -> request counts and latencies
+
+Connections are kept alive (HTTP/1.1) and the cipher work runs in a process
+pool so the event loop only parses requests and writes responses.
+"""
+import argparse
+import asyncio
+import json
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from vigenere_cipher import encrypt_vigenere, decrypt_vigenere
+from frequency_analysis import analyze_vigenere_key_length, break_vigenere_cipher
+from polyalphabetic import to_codes
+
+# Largest request body accepted, in bytes
+MAX_BODY_SIZE = 10 * 1024 * 1024
+
+# Largest number of operations accepted in one /batch request
+MAX_BATCH_SIZE = 1000
+
+# Largest key_length (/break) and max_length (/analyze) accepted
+MAX_KEY_LENGTH = 100
+
+# Number of recent latencies kept per endpoint for the percentiles in /metrics
+LATENCY_WINDOW = 10000
+
+REASONS = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    413: "Payload Too Large",
+    500: "Internal Server Error",
+}
+
+class RequestError(Exception):
+    """A client error, reported back as a JSON error with the given status."""
+
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.status = status
+
+def _encrypt(params):
+    return {"result": encrypt_vigenere(params["text"], params["key"])}
+
+def _decrypt(params):
+    return {"result": decrypt_vigenere(params["text"], params["key"])}
+
+def _check_length(name, value, limit):
+    value = int(value)
+    if not 1 <= value <= limit:
+        raise ValueError(f"{name} must be between 1 and {limit}")
+    return value
+
+def _analyze(params):
+    max_length = _check_length("max_length", params.get("max_length", 20), MAX_KEY_LENGTH)
+    results = analyze_vigenere_key_length(params["ciphertext"], max_length)
+    # JSON object keys must be strings
+    return {"key_lengths": {str(length): ic for length, ic in results.items()}}
+
+def _break(params):
+    codes = to_codes(params["ciphertext"])
+    # A key longer than the ciphertext cannot be recovered
+    key_length = _check_length("key_length", params["key_length"], min(MAX_KEY_LENGTH, max(codes.size, 1)))
+    plaintext, key = break_vigenere_cipher(codes, key_length)
+    return {"plaintext": plaintext, "key": key}
+
+OPERATIONS = {
+    "encrypt": _encrypt,
+    "decrypt": _decrypt,
+    "analyze": _analyze,
+    "break": _break,
+}
+
+ENDPOINTS = {"/health", "/metrics", "/batch"} | {f"/{op}" for op in OPERATIONS}
+
+def execute(op, params):
+    """
+    Run a single operation. Executed inside the worker processes.
+
+    Returns:
+        dict: The operation result, or ``{"error": ...}`` for invalid input
+    """
+    try:
+        return OPERATIONS[op](params)
+    except KeyError as e:
+        return {"error": f"Missing parameter: {e.args[0]}"}
+    except (TypeError, ValueError) as e:
+        return {"error": str(e)}
+
+def execute_batch(items):
+    """Run several operations in one worker call to amortize the IPC cost."""
+    # A non-string op (e.g. a list) cannot be looked up, it is just unknown
+    return [execute(item["op"], item) if isinstance(item.get("op"), str) and item["op"] in OPERATIONS
+            else {"error": f"Unknown operation: {item.get('op')}"}
+            for item in items]
+
+class Metrics:
+    """Request counters and recent latencies per endpoint."""
+
+    def __init__(self):
+        self.started = time.monotonic()
+        self.requests = {}
+        self.errors = {}
+        self.latencies = {}
+        self.in_flight = 0
+
+    def record(self, endpoint, seconds, failed):
+        self.requests[endpoint] = self.requests.get(endpoint, 0) + 1
+        if failed:
+            self.errors[endpoint] = self.errors.get(endpoint, 0) + 1
+        self.latencies.setdefault(endpoint, deque(maxlen=LATENCY_WINDOW)).append(seconds)
+
+    def snapshot(self):
+        endpoints = {}
+        for endpoint, count in self.requests.items():
+            samples = sorted(self.latencies[endpoint])
+            endpoints[endpoint] = {
+                "requests": count,
+                "errors": self.errors.get(endpoint, 0),
+                "p50_ms": _percentile(samples, 0.50) * 1000,
+                "p99_ms": _percentile(samples, 0.99) * 1000,
+            }
+        return {
+            "uptime_seconds": time.monotonic() - self.started,
+            "in_flight": self.in_flight,
+            "endpoints": endpoints,
+        }
+
+def _percentile(sorted_samples, q):
+    if not sorted_samples:
+        return 0.0
+    index = min(len(sorted_samples) - 1, int(q * len(sorted_samples)))
+    return sorted_samples[index]
+
+class APIServer:
+    """
+    Asyncio HTTP server dispatching cipher operations to a process pool.
+
+    Args:
+        workers (int): Number of worker processes (defaults to the CPU count)
+    """
+
+    def __init__(self, workers=None):
+        self.pool = ProcessPoolExecutor(max_workers=workers or os.cpu_count())
+        self.metrics = Metrics()
+
+    async def serve(self, host="127.0.0.1", port=8080):
+        server = await asyncio.start_server(self.handle_connection, host, port)
+        async with server:
+            await server.serve_forever()
+
+    async def handle_connection(self, reader, writer):
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b"\r\n\r\n")
+                except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+                    break
+
+                request_line, *header_lines = head.decode("latin-1").split("\r\n")
+                try:
+                    method, path, version = request_line.split(" ", 2)
+                except ValueError:
+                    await self._write(writer, 400, {"error": "Malformed request line"}, keep_alive=False)
+                    break
+
+                headers = {}
+                for line in header_lines:
+                    if ":" in line:
+                        name, value = line.split(":", 1)
+                        headers[name.strip().lower()] = value.strip()
+
+                connection = headers.get("connection", "").lower()
+                keep_alive = connection != "close" if version == "HTTP/1.1" else connection == "keep-alive"
+
+                try:
+                    length = int(headers.get("content-length", 0) or 0)
+                except ValueError:
+                    await self._write(writer, 400, {"error": "Invalid Content-Length"}, keep_alive=False)
+                    break
+                if length > MAX_BODY_SIZE:
+                    await self._write(writer, 413, {"error": "Request body too large"}, keep_alive=False)
+                    break
+                try:
+                    body = await reader.readexactly(length) if length else b""
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    break
+
+                status, payload = await self.dispatch(method, path.split("?", 1)[0], body)
+                await self._write(writer, status, payload, keep_alive)
+                if not keep_alive:
+                    break
+        finally:
+            writer.close()
+
+    async def dispatch(self, method, path, body):
+        """
+        Route a request and return ``(status, payload)``.
+        """
+        start = time.perf_counter()
+        self.metrics.in_flight += 1
+        status = 500
+        try:
+            status, payload = await self._route(method, path, body)
+        except RequestError as e:
+            status, payload = e.status, {"error": str(e)}
+        except Exception as e:
+            payload = {"error": f"Internal error: {e}"}
+        finally:
+            self.metrics.in_flight -= 1
+            endpoint = path if path in ENDPOINTS else "other"
+            self.metrics.record(endpoint, time.perf_counter() - start, status != 200)
+        return status, payload
+
+    async def _route(self, method, path, body):
+        if path == "/health":
+            return 200, {"status": "ok"}
+        if path == "/metrics":
+            return 200, self.metrics.snapshot()
+
+        op = path.lstrip("/")
+        if op != "batch" and op not in OPERATIONS:
+            raise RequestError(f"Unknown endpoint: {path}", 404)
+        if method != "POST":
+            raise RequestError("Use POST for this endpoint", 405)
+
+        try:
+            params = json.loads(body or b"{}")
+        except ValueError:
+            raise RequestError("Request body is not valid JSON")
+        if not isinstance(params, dict):
+            raise RequestError("Request body must be a JSON object")
+
+        loop = asyncio.get_running_loop()
+        if op == "batch":
+            items = params.get("requests")
+            if not isinstance(items, list) or not all(isinstance(item, dict) for item in items):
+                raise RequestError("'requests' must be a list of objects")
+            if len(items) > MAX_BATCH_SIZE:
+                raise RequestError(f"At most {MAX_BATCH_SIZE} requests per batch", 413)
+            results = await loop.run_in_executor(self.pool, execute_batch, items)
+            return 200, {"results": results}
+
+        result = await loop.run_in_executor(self.pool, execute, op, params)
+        if "error" in result:
+            raise RequestError(result["error"])
+        return 200, result
+
+    async def _write(self, writer, status, payload, keep_alive):
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        head = (
+            f"HTTP/1.1 {status} {REASONS.get(status, '')}\r\n"
+            f"Content-Type: application/json; charset=utf-8\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n"
+            "\r\n"
+        ).encode("latin-1")
+        writer.write(head + body)
+        await writer.drain()
+
+    def close(self):
+        self.pool.shutdown(cancel_futures=True)
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve the Vigenère tools as a JSON API.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    args = parser.parse_args()
+
+    server = APIServer(workers=args.workers)
+    print(f"Serving on http://{args.host}:{args.port}")
+    try:
+        asyncio.run(server.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
+
+if __name__ == "__main__":
+    main()
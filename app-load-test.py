@@ -0,0 +1,202 @@
+"""
+Multi-session load test for the Streamlit app.
+
+Simulates N concurrent learners walking through all four levels with
+``streamlit.testing`` (no browser needed), answering each challenge through
+the same widgets and callbacks a student would use. It records the rerun
+latency of every step per level, the peak RSS and the CPU time of the
+process, and writes a JSON report that can be compared with a previous one.
+Progress is saved to a temporary database that is deleted on exit, and the
+exit status is 1 if any session could not finish the mission:
+
+    python app-load-test.py --sessions 20 --output report.json
+    python app-load-test.py --sessions 20 --baseline report.json
+"""
+import argparse
+import atexit
+import json
+import os
+import resource
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from streamlit.testing.v1 import AppTest
+
+from vigenere_cipher import encrypt_vigenere
+
+APP_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "app.py")
+
+# Compiling the app script from several threads at once can crash the parser,
+# so each session's first (compiling) run is serialized.
+_first_run_lock = threading.Lock()
+
+class Session:
+    """One simulated learner, timing every rerun it triggers."""
+
+    def __init__(self, timeout):
+        self.app = AppTest.from_file(APP_PATH, default_timeout=timeout)
+        self.timings = []
+
+    def step(self, level, action):
+        try:
+            widget = action()
+        except KeyError as e:
+            # The widget this step needs is not on the page
+            raise RuntimeError(f"Level {level}: widget {e} is not reachable") from None
+        start = time.perf_counter()
+        widget.run()
+        self.timings.append((level, time.perf_counter() - start))
+        if self.app.exception:
+            raise RuntimeError(f"Level {level}: {self.app.exception[0].value}")
+
+    def expect_level(self, level):
+        self.step(level, lambda: self.app)
+        if self.app.session_state["game_level"] != level:
+            raise RuntimeError(f"Level {level} was not reached (still at level {self.app.session_state['game_level']})")
+
+    def walk_through(self):
+        app = self.app
+        with _first_run_lock:
+            self.step(1, lambda: app)
+
+        # Level 1: the text input triggers update_level1_answer
+        self.step(1, lambda: app.text_input(key="level1_answer").set_value(encrypt_vigenere("VIETNAM", "KEY")))
+        self.step(1, lambda: app.button(key="level1_next").click())
+        # The level changes during the click's rerun, the new level renders on the next one
+        self.expect_level(2)
+
+        # Level 2: update_level2_answer runs from the check button
+        self.step(2, lambda: app.text_input(key="level2_key").set_value("HANOI"))
+        self.step(2, lambda: app.text_input(key="level2_answer").set_value("CHUCMUNGBANDALAMNENLEVEL"))
+        self.step(2, lambda: app.button(key="check_level2").click())
+        self.step(2, lambda: app.button(key="level2_next").click())
+        self.expect_level(3)
+
+        # Level 3: the quiz appears after the right key length is tried
+        self.step(3, lambda: app.button(key="break_cipher_btn").click())
+        self.step(3, lambda: app.radio(key="level3_message_type").set_value("Hướng dẫn về bảo mật thông tin"))
+        self.step(3, lambda: app.button(key="submit_level3").click())
+        self.step(3, lambda: app.button(key="level3_next").click())
+
+        # Level 4: the analysis runs as a background job, poll until it finishes
+        self.expect_level(4)
+        self.step(4, lambda: app.button(key="analyze_final_key").click())
+        for _ in range(100):
+            job = app.session_state["jobs"].get(app.session_state["final_analysis_job"])
+            if job is None or job.finished:
+                break
+            time.sleep(0.05)
+            self.step(4, lambda: app)
+        self.step(4, lambda: app.text_input(key="final_key").set_value("CIPHER"))
+        self.step(4, lambda: app.text_area(key="final_message").set_value("Hướng dẫn về bảo mật thông tin"))
+        self.step(4, lambda: app.button(key="complete_final").click())
+
+        if not app.session_state["final_challenge_completed"]:
+            raise RuntimeError("Session did not complete the final challenge")
+        if not app.session_state["mission_completed"]:
+            raise RuntimeError(f"Session did not complete the mission "
+                               f"({app.session_state['challenges_completed']}/3 challenges)")
+
+def run_session(timeout):
+    session = Session(timeout)
+    try:
+        session.walk_through()
+        return session.timings, None
+    except Exception as e:
+        return session.timings, f"{type(e).__name__}: {e}"
+
+def percentile(sorted_samples, q):
+    index = min(len(sorted_samples) - 1, int(q * len(sorted_samples)))
+    return sorted_samples[index]
+
+def peak_rss_mb():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in kilobytes elsewhere
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+def run(sessions, concurrency, timeout):
+    cpu_start = os.times()
+    wall_start = time.perf_counter()
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        outcomes = list(pool.map(lambda _: run_session(timeout), range(sessions)))
+
+    wall = time.perf_counter() - wall_start
+    cpu_end = os.times()
+    cpu = (cpu_end.user - cpu_start.user) + (cpu_end.system - cpu_start.system)
+
+    per_level = {}
+    for timings, _ in outcomes:
+        for level, seconds in timings:
+            per_level.setdefault(level, []).append(seconds)
+
+    levels = {}
+    for level, samples in sorted(per_level.items()):
+        samples.sort()
+        levels[str(level)] = {
+            "reruns": len(samples),
+            "p50_ms": percentile(samples, 0.50) * 1000,
+            "p95_ms": percentile(samples, 0.95) * 1000,
+            "p99_ms": percentile(samples, 0.99) * 1000,
+            "max_ms": samples[-1] * 1000,
+        }
+
+    return {
+        "sessions": sessions,
+        "concurrency": concurrency,
+        "completed": sum(1 for _, error in outcomes if error is None),
+        "errors": [error for _, error in outcomes if error is not None],
+        "wall_seconds": wall,
+        "cpu_seconds": cpu,
+        "cpu_utilization": cpu / wall if wall else 0.0,
+        "peak_rss_mb": peak_rss_mb(),
+        "levels": levels,
+    }
+
+def compare(report, baseline):
+    """Print the relative change of each latency figure against a baseline report."""
+    print(f"{'Level':<6}{'Metric':<12}{'Baseline':>12}{'Current':>12}{'Change':>10}")
+    for level, current in report["levels"].items():
+        previous = baseline.get("levels", {}).get(level)
+        if previous is None:
+            continue
+        for metric in ("p50_ms", "p99_ms"):
+            change = (current[metric] - previous[metric]) / previous[metric] * 100 if previous[metric] else 0.0
+            print(f"{level:<6}{metric:<12}{previous[metric]:>12.1f}{current[metric]:>12.1f}{change:>+9.1f}%")
+    for metric in ("peak_rss_mb", "cpu_seconds"):
+        print(f"{'':<6}{metric:<12}{baseline.get(metric, 0):>12.1f}{report[metric]:>12.1f}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulate concurrent learners walking through the app.")
+    parser.add_argument("--sessions", type=int, default=10, help="Number of learners to simulate")
+    parser.add_argument("--concurrency", type=int, default=None, help="Sessions running at once (default: all)")
+    parser.add_argument("--timeout", type=float, default=60, help="Seconds allowed per rerun")
+    parser.add_argument("--output", help="Write the JSON report to this file")
+    parser.add_argument("--baseline", help="Compare against a previous JSON report")
+    args = parser.parse_args()
+
+    # The fake learners go to a throwaway database, never to the real progress.sqlite.
+    # Registered before the app registers its store's close(), so it is removed after it.
+    progress_dir = tempfile.mkdtemp(prefix="app-load-test-")
+    atexit.register(shutil.rmtree, progress_dir, ignore_errors=True)
+    os.environ["VIGENERE_PROGRESS_DB"] = os.path.join(progress_dir, "progress.sqlite")
+
+    report = run(args.sessions, args.concurrency or args.sessions, args.timeout)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    print(json.dumps(report, indent=2, ensure_ascii=False))
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            compare(report, json.load(f))
+
+    sys.exit(1 if report["errors"] else 0)
+
+if __name__ == "__main__":
+    main()
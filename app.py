@@ -1,19 +1,31 @@
 import streamlit as st
 import numpy as np
-import matplotlib.pyplot as plt
 from vigenere_cipher import encrypt_vigenere, decrypt_vigenere, caesar_shift
 from frequency_analysis import (
     calculate_frequencies, 
     plot_frequencies, 
-    analyze_vigenere_key_length,
-    break_vigenere_cipher
+    break_vigenere_cipher,
+    score_shifts
 )
+from plausibility import score_plaintext
+from caesar import caesar_encrypt, crack_caesar, letter_counts
+from challenges import EXAMPLE_CIPHER, FINAL_CIPHER, MAX_KEY_LENGTH, tabula_recta_markdown, analyze_challenge
+import artifacts
+from jobs import JobRunner, DONE, FAILED, CANCELLED
+from progress_store import ProgressStore, DEFAULT_DB_PATH, FIELDS as PROGRESS_FIELDS
+import instrumentation
+from contextlib import nullcontext
 from googletrans import Translator
 from PIL import Image, ImageDraw, ImageFont
 import io
 import base64
 import random
 import os
+import uuid
+import atexit
+import logging
+
+logger = logging.getLogger(__name__)
 
 # Setup translations
 translator = Translator()
@@ -131,14 +143,104 @@ if 'level3_submitted' not in st.session_state:
     st.session_state.level3_submitted = False
 if 'level3_correct' not in st.session_state:
     st.session_state.level3_correct = False
+if 'level3_cracked' not in st.session_state:
+    st.session_state.level3_cracked = False  # Right key length found, the quiz stays shown
 if 'final_challenge_completed' not in st.session_state:
     st.session_state.final_challenge_completed = False
+if 'jobs' not in st.session_state:
+    st.session_state.jobs = {}  # Background analyses of this session, by job id
+if 'final_analysis_job' not in st.session_state:
+    st.session_state.final_analysis_job = None
+if 'final_analysis_length' not in st.session_state:
+    st.session_state.final_analysis_length = None
+
+@st.cache_resource
+def load_artifacts():
+    # Precomputed by `python artifacts.py` at build time; None if missing or stale
+    loaded, reason = artifacts.load()
+    if loaded is None:
+        logger.warning("Không dùng artifacts dựng sẵn (%s), tính trực tiếp", reason)
+    return loaded
+
+@st.cache_resource
+def challenge_analysis(name):
+    """IoC table, candidate keys and IoC chart of a challenge, computed at most once per process"""
+    loaded = load_artifacts()
+    if loaded is not None and name in loaded["challenges"]:
+        return loaded["challenges"][name]
+    return analyze_challenge(name)
+
+def crack_with_candidates(ciphertext, key_length, candidate_keys):
+    """Use the precomputed key for this length if there is one, otherwise break the cipher"""
+    key = candidate_keys.get(key_length)
+    if key is None:
+        return break_vigenere_cipher(ciphertext, key_length)
+    return decrypt_vigenere(ciphertext, key), key
+
+@st.cache_resource
+def get_job_runner():
+    # One worker pool per process, shared by all sessions
+    return JobRunner()
+
+@st.cache_resource
+def get_progress_store():
+    # One writer thread per process; pending states are written on shutdown
+    store = ProgressStore(os.environ.get("VIGENERE_PROGRESS_DB", DEFAULT_DB_PATH))
+    atexit.register(store.close)
+    return store
+
+@st.cache_data(ttl=30)
+def class_progress():
+    """Aggregate progress of all learners, refreshed at most every 30 seconds"""
+    return get_progress_store().stats()
+
+def save_progress():
+    """Queue the progress of this learner; the write happens in the background"""
+    state = {name: st.session_state[name] for name in PROGRESS_FIELDS}
+    get_progress_store().save(st.session_state.learner_id, state)
+
+if 'learner_id' not in st.session_state:
+    # The learner id lives in the URL, so reconnecting or reloading restores the progress
+    st.session_state.learner_id = st.query_params.get("learner") or uuid.uuid4().hex
+    st.query_params["learner"] = st.session_state.learner_id
+    saved = get_progress_store().load(st.session_state.learner_id)
+    if saved is not None:
+        for name, value in saved.items():
+            st.session_state[name] = value
+
+def submit_job(slot, func, *args, label=""):
+    """Run func in the background and remember the job under the given session state slot"""
+    previous = st.session_state.jobs.pop(st.session_state[slot], None)
+    if previous is not None and not previous.finished:
+        previous.cancel()
+    
+    job = get_job_runner().submit(func, *args, label=label)
+    st.session_state.jobs[job.id] = job
+    st.session_state[slot] = job.id
+    return job
+
+@st.fragment(run_every=0.5)
+def show_job_progress(job_id):
+    # Polls only this fragment, so the rest of the page stays interactive
+    job = st.session_state.jobs[job_id]
+    if job.finished:
+        st.rerun()
+    
+    st.progress(job.progress, text=f"{job.label} ({job.progress:.0%})")
+    if st.button("Hủy phân tích", key=f"cancel_{job_id}"):
+        job.cancel()
 
 def complete_challenge():
-    st.session_state.challenges_completed += 1
+    # Derived from the results, so answering again never counts twice; the
+    # mission needs three of the four challenges
+    st.session_state.challenges_completed = min(3, sum(
+        st.session_state[name]
+        for name in ("level1_correct", "level2_correct", "level3_correct", "final_challenge_completed")
+    ))
     st.session_state.show_animation = True
     if st.session_state.challenges_completed >= 3:
         st.session_state.mission_completed = True
+    save_progress()
 
 def level_up(level=None):
     if level:
@@ -146,6 +248,7 @@ def level_up(level=None):
     else:
         st.session_state.game_level += 1
     st.session_state.show_animation = True
+    save_progress()
     
 def update_level1_answer():
     st.session_state.level1_submitted = True
@@ -166,71 +269,82 @@ def update_level3_answer(selected_option):
         st.session_state.level3_correct = True
         complete_challenge()
 
+# Maximum number of rows rendered at once in the step-by-step tables
+STEP_TABLE_PAGE_SIZE = 50
+
+def _step_table_window(source, key, result, start, stop, decrypt):
+    """Build the columns of the step table for positions [start, stop) only."""
+    positions = np.arange(start, stop)
+    source_codes = np.fromiter(map(ord, source[start:stop]), dtype=np.int64, count=stop - start) - ord('A')
+    key_codes = np.fromiter(map(ord, key), dtype=np.int64, count=len(key)) - ord('A')
+    # Index the key directly instead of building the repeated key string
+    stream_codes = key_codes[positions % len(key)]
+    
+    if decrypt:
+        result_codes = (source_codes - stream_codes) % 26
+        operator = "-"
+    else:
+        result_codes = (source_codes + stream_codes) % 26
+        operator = "+"
+    
+    return {
+        "source_chars": list(source[start:stop]),
+        "source_codes": source_codes,
+        "key_chars": [key[i] for i in positions % len(key)],
+        "key_codes": stream_codes,
+        "calculations": [
+            f"({s} {operator} {k}) % 26 = {r}"
+            for s, k, r in zip(source_codes.tolist(), stream_codes.tolist(), result_codes.tolist())
+        ],
+        "result_chars": list(result[start:stop]),
+        "steps": positions + 1,
+    }
+
+@st.fragment
+def _show_step_table(source, key, result, decrypt, table_key, columns):
+    # Only the current page is computed and rendered, so long inputs cost the same as short ones
+    total = len(source)
+    pages = max(1, -(-total // STEP_TABLE_PAGE_SIZE))
+    
+    page = 1
+    if pages > 1:
+        page = st.number_input(
+            f"Trang (1-{pages})", min_value=1, max_value=pages, value=1, step=1, key=f"{table_key}_page"
+        )
+    
+    start = (page - 1) * STEP_TABLE_PAGE_SIZE
+    stop = min(start + STEP_TABLE_PAGE_SIZE, total)
+    window = _step_table_window(source, key, result, start, stop, decrypt)
+    
+    st.dataframe(
+        {
+            "Bước": window["steps"],
+            columns[0]: window["source_chars"],
+            columns[1]: window["source_codes"],
+            "Khóa": window["key_chars"],
+            "K (0-25)": window["key_codes"],
+            "Tính toán": window["calculations"],
+            columns[2]: window["result_chars"],
+        },
+        hide_index=True,
+    )
+    
+    if pages > 1:
+        st.caption(f"Hiển thị bước {start + 1}-{stop} trên tổng số {total} bước")
+
 def show_encryption_steps(plaintext, key, ciphertext):
     # Create a table showing the encryption process
-    data = []
-    extended_key = (key * (len(plaintext) // len(key) + 1))[:len(plaintext)]
-    
-    for i in range(len(plaintext)):
-        p_char = plaintext[i]
-        k_char = extended_key[i]
-        c_char = ciphertext[i]
-        
-        p_num = ord(p_char) - ord('A')
-        k_num = ord(k_char) - ord('A')
-        c_num = (p_num + k_num) % 26
-        
-        data.append([
-            i+1,
-            p_char,
-            p_num,
-            k_char,
-            k_num,
-            f"({p_num} + {k_num}) % 26 = {c_num}",
-            c_char
-        ])
-    
-    # Display as a table
-    table = "| Bước | Văn bản gốc | P (0-25) | Khóa | K (0-25) | Tính toán | Mật mã |\n"
-    table += "|------|-----------|----------|-----|----------|-------------|------------|\n"
-    
-    for row in data:
-        table += f"| {row[0]} | {row[1]} | {row[2]} | {row[3]} | {row[4]} | {row[5]} | {row[6]} |\n"
-    
-    st.markdown(table)
+    _show_step_table(
+        plaintext, key, ciphertext, False, "encryption_steps",
+        ("Văn bản gốc", "P (0-25)", "Mật mã"),
+    )
 
 def show_decryption_steps(ciphertext, key, plaintext):
     # Create a table showing the decryption process
-    data = []
-    extended_key = (key * (len(ciphertext) // len(key) + 1))[:len(ciphertext)]
-    
-    for i in range(len(ciphertext)):
-        c_char = ciphertext[i]
-        k_char = extended_key[i]
-        p_char = plaintext[i]
-        
-        c_num = ord(c_char) - ord('A')
-        k_num = ord(k_char) - ord('A')
-        p_num = (c_num - k_num) % 26
-        
-        data.append([
-            i+1,
-            c_char,
-            c_num,
-            k_char,
-            k_num,
-            f"({c_num} - {k_num}) % 26 = {p_num}",
-            p_char
-        ])
-    
-    # Display as a table
-    table = "| Bước | Mật mã | C (0-25) | Khóa | K (0-25) | Tính toán | Văn bản gốc |\n"
-    table += "|------|------------|----------|-----|----------|-------------|----------|\n"
-    
-    for row in data:
-        table += f"| {row[0]} | {row[1]} | {row[2]} | {row[3]} | {row[4]} | {row[5]} | {row[6]} |\n"
-    
-    st.markdown(table)
+    _show_step_table(
+        ciphertext, key, plaintext, True, "decryption_steps",
+        ("Mật mã", "C (0-25)", "Văn bản gốc"),
+    )
 
 def level_1_intro():
     st.markdown(translations["introduction"])
@@ -253,21 +367,9 @@ def level_1_intro():
     # Visualization of how the cipher works
     st.subheader("Bảng Vigenère (Tabula Recta)")
     
-    # Creating the Vigenère square using a monospaced font in markdown
-    square = "```\n   " + " ".join([chr(65+i) for i in range(26)]) + "\n"
-    square += "  +" + "-" * 51 + "\n"
-    
-    for i in range(26):
-        row = chr(65+i) + " | "
-        for j in range(26):
-            # Calculate the letter for this position in the Vigenère square
-            letter = chr(65 + (i + j) % 26)
-            row += letter + " "
-        square += row + "\n"
-    
-    square += "```"
-    
-    st.markdown(square)
+    # The Vigenère square in a monospaced code block, built once at build time
+    loaded = load_artifacts()
+    st.markdown(loaded["tabula_recta"] if loaded is not None else tabula_recta_markdown())
     
     st.markdown("""
     ### Cách sử dụng Bảng Vigenère:
@@ -453,6 +555,18 @@ def level_3_breaking_cipher():
     - Khi độ dài khóa được xác định, nó giảm xuống thành nhiều mật mã Caesar
     """)
     
+    # A Caesar cipher falls to trying all 26 shifts, scored from one letter count
+    with st.expander("🔓 Thử phá mã Caesar"):
+        caesar_plaintext = st.text_input("Văn bản gốc:", value="Meet me at the old bridge at midnight", key="caesar_plaintext")
+        caesar_key = st.slider("Độ dịch chuyển:", min_value=1, max_value=25, value=3, key="caesar_key")
+        caesar_ciphertext = caesar_encrypt(caesar_plaintext, caesar_key)
+        st.markdown(f"Mật mã Caesar: **{caesar_ciphertext}**")
+        
+        found_shift, found_plaintext, _ = crack_caesar(caesar_ciphertext)
+        st.caption("Chi-squared của từng độ dịch chuyển (càng thấp càng giống tiếng Anh)")
+        st.bar_chart(score_shifts(letter_counts(caesar_ciphertext)))
+        st.success(f"Độ dịch chuyển tìm được: {found_shift} → {found_plaintext}")
+    
     # Interactive demonstration
     st.subheader("Thử phá vỡ mật mã")
     
@@ -466,26 +580,9 @@ def level_3_breaking_cipher():
     Hãy sử dụng công cụ phân tích để tìm độ dài khóa!
     """)
     
-    # Example ciphertext
-    example_cipher = "LWSSUCMZXMGZTTZSUOAXZWBHGWOMHXQVTVPVGAGZHTVTVVSMKFMTVIKHRZTWWWPMLZLGMXEOAGZJGMSMHMVCSWTXQVTVPBKHRZXWIIMATRVMPLRPV"
-    
     # Show IoC for different key lengths for the example
-    key_length_data = analyze_vigenere_key_length(example_cipher, max_length=15)
-    
-    fig, ax = plt.subplots(figsize=(10, 5))
-    key_lengths = list(key_length_data.keys())
-    index_values = list(key_length_data.values())
-    
-    ax.bar(key_lengths, index_values, color='skyblue')
-    ax.set_xlabel('Độ dài khóa (Key Length)')
-    ax.set_ylabel('Chỉ số trùng khớp (Index of Coincidence)')
-    ax.set_title('Chỉ số trùng khớp cho các độ dài khóa khác nhau')
-    ax.set_xticks(key_lengths)
-    ax.grid(axis='y', linestyle='--', alpha=0.7)
-    ax.axhline(y=0.067, color='r', linestyle='-', alpha=0.7, label='Dự kiến cho tiếng Anh (Expected for English)')
-    ax.legend()
-    
-    st.pyplot(fig)
+    example_analysis = challenge_analysis("example")
+    st.image(example_analysis["chart_png"])
     
     st.markdown("""
     Chỉ số trùng khớp (Index of Coincidence - IoC) đo xác suất hai chữ cái được chọn ngẫu nhiên trong một văn bản là giống nhau.
@@ -498,45 +595,50 @@ def level_3_breaking_cipher():
     **Dựa vào biểu đồ trên, độ dài khóa có thể là bao nhiêu?**
     """)
     
-    user_key_length = st.number_input("Nhập độ dài khóa bạn cho là đúng:", min_value=1, max_value=15, value=5)
+    user_key_length = st.number_input("Nhập độ dài khóa bạn cho là đúng:", min_value=1, max_value=MAX_KEY_LENGTH, value=5)
     
     if st.button("Thử phá mã", key="break_cipher_btn"):
-        if user_key_length == 5:
-            decrypted_text, discovered_key = break_vigenere_cipher(example_cipher, user_key_length)
-            st.success(f"Độ dài khóa đúng! Khóa có thể là: {discovered_key}")
-            st.markdown(f"Văn bản giải mã: **{decrypted_text}**")
-            
-            # Challenge to complete level 3
-            st.markdown("### 🎮 Thử thách Phá mã")
-            st.markdown("""
-            Bây giờ hãy trả lời câu hỏi này dựa trên văn bản đã giải mã:
-            
-            Ý nghĩa của thông điệp là gì? (Chọn một trong các lựa chọn sau)
-            """)
-            
-            message_meaning = st.radio(
-                "Ý nghĩa của thông điệp:",
-                ["Một bài thơ về tình yêu", "Một trích đoạn từ sách", "Hướng dẫn về bảo mật thông tin", "Kế hoạch bí mật"],
-                key="level3_message_type"
-            )
-            
-            # Button to submit the answer
-            if st.button("Gửi câu trả lời", key="submit_level3"):
-                update_level3_answer(message_meaning)
-            
-            # Display result after submission  
-            if st.session_state.level3_submitted:
-                if st.session_state.level3_correct:
-                    st.success("Chính xác! Thông điệp là về bảo mật thông tin.")
-                    st.balloons()
-                    
-                    # Show next level button
-                    if st.button(f"{translations['next_level']} ➡️", key="level3_next"):
-                        level_up(4)
-                else:
-                    st.error("Không chính xác. Hãy đọc kỹ thông điệp và thử lại!")
-        else:
+        # Remembered, so that the quiz below survives the reruns of its own widgets
+        st.session_state.level3_cracked = user_key_length == 5
+        if not st.session_state.level3_cracked:
             st.error("Độ dài khóa không chính xác. Hãy xem kỹ biểu đồ và thử lại!")
+    
+    if st.session_state.level3_cracked:
+        decrypted_text, discovered_key = crack_with_candidates(
+            EXAMPLE_CIPHER, 5, example_analysis["candidate_keys"]
+        )
+        st.success(f"Độ dài khóa đúng! Khóa có thể là: {discovered_key}")
+        st.markdown(f"Văn bản giải mã: **{decrypted_text}**")
+        
+        # Challenge to complete level 3
+        st.markdown("### 🎮 Thử thách Phá mã")
+        st.markdown("""
+        Bây giờ hãy trả lời câu hỏi này dựa trên văn bản đã giải mã:
+        
+        Ý nghĩa của thông điệp là gì? (Chọn một trong các lựa chọn sau)
+        """)
+        
+        message_meaning = st.radio(
+            "Ý nghĩa của thông điệp:",
+            ["Một bài thơ về tình yêu", "Một trích đoạn từ sách", "Hướng dẫn về bảo mật thông tin", "Kế hoạch bí mật"],
+            key="level3_message_type"
+        )
+        
+        # Button to submit the answer
+        if st.button("Gửi câu trả lời", key="submit_level3"):
+            update_level3_answer(message_meaning)
+        
+        # Display result after submission  
+        if st.session_state.level3_submitted:
+            if st.session_state.level3_correct:
+                st.success("Chính xác! Thông điệp là về bảo mật thông tin.")
+                st.balloons()
+                
+                # Show next level button
+                if st.button(f"{translations['next_level']} ➡️", key="level3_next"):
+                    level_up(4)
+            else:
+                st.error("Không chính xác. Hãy đọc kỹ thông điệp và thử lại!")
 
 def level_4_hacker_challenge():
     st.header("Cấp độ 4: Thử thách Hacker")
@@ -561,36 +663,40 @@ def level_4_hacker_challenge():
     Bạn có thể sử dụng các công cụ phân tích bên dưới để giúp bạn!
     """)
     
-    # Final challenge ciphertext 
-    final_cipher = "PZSVYMFCCKIQXSZWRLFWOZGIILSWVMBZPESJLVYYVHWPIKBCMBGPLYPCDZMFOWVSLRLLRYCAZCKIQXSZRDAFDRVHZBQHYYVHWPIUBCWVDRLQMLVDEBVVBDTZWRLVVBDSEXZIGOEHQTVLWIMYWMDIFGGEIGGZRFBBX"
-    
     # Show IoC analysis for final challenge
-    final_key_length_data = analyze_vigenere_key_length(final_cipher, max_length=15)
-    
-    fig, ax = plt.subplots(figsize=(10, 5))
-    key_lengths = list(final_key_length_data.keys())
-    index_values = list(final_key_length_data.values())
-    
-    ax.bar(key_lengths, index_values, color='skyblue')
-    ax.set_xlabel('Độ dài khóa (Key Length)')
-    ax.set_ylabel('Chỉ số trùng khớp (IoC)')
-    ax.set_title('Chỉ số trùng khớp cho mật mã cuối cùng')
-    ax.set_xticks(key_lengths)
-    ax.grid(axis='y', linestyle='--', alpha=0.7)
-    ax.axhline(y=0.067, color='r', linestyle='-', alpha=0.7, label='Dự kiến cho tiếng Anh')
-    ax.legend()
-    
-    st.pyplot(fig)
+    final_analysis = challenge_analysis("final")
+    st.image(final_analysis["chart_png"])
     
     # Let the user try to break the cipher
     st.subheader("Công cụ phá mã")
     
-    user_final_key_length = st.number_input("Nhập độ dài khóa bạn muốn thử:", min_value=1, max_value=15, value=6)
+    user_final_key_length = st.number_input("Nhập độ dài khóa bạn muốn thử:", min_value=1, max_value=MAX_KEY_LENGTH, value=6)
     
     if st.button("Phân tích với độ dài khóa này", key="analyze_final_key"):
-        decrypted_text, discovered_key = break_vigenere_cipher(final_cipher, user_final_key_length)
-        st.markdown(f"**Khóa có thể:** {discovered_key}")
-        st.markdown(f"**Văn bản giải mã:**\n\n{decrypted_text}")
+        # The real analysis runs in the background; the precomputed key is only a preview
+        submit_job(
+            "final_analysis_job", break_vigenere_cipher, FINAL_CIPHER, user_final_key_length,
+            label=f"Đang phân tích với độ dài khóa {user_final_key_length}",
+        )
+        st.session_state.final_analysis_length = user_final_key_length
+    
+    final_job = st.session_state.jobs.get(st.session_state.final_analysis_job)
+    if final_job is not None:
+        if not final_job.finished:
+            preview_key = final_analysis["candidate_keys"].get(st.session_state.final_analysis_length)
+            if preview_key is not None:
+                st.markdown(f"**Khóa tính sẵn (đang phân tích lại):** {preview_key}")
+            show_job_progress(final_job.id)
+        elif final_job.status == DONE:
+            decrypted_text, discovered_key = final_job.result
+            confidence = score_plaintext(decrypted_text)["confidence"]
+            st.markdown(f"**Khóa có thể:** {discovered_key}")
+            st.progress(confidence, text=f"Độ tin cậy văn bản là tiếng Anh: {confidence:.0%}")
+            st.markdown(f"**Văn bản giải mã:**\n\n{decrypted_text}")
+        elif final_job.status == CANCELLED:
+            st.warning("Đã hủy phân tích.")
+        elif final_job.status == FAILED:
+            st.error(f"Phân tích thất bại: {final_job.error}")
     
     # Final answer submission
     st.markdown("---")
@@ -601,12 +707,13 @@ def level_4_hacker_challenge():
     
     if st.button("Hoàn thành Thử thách", key="complete_final"):
         if final_key.upper() == "CIPHER" and "thông tin" in final_message.lower() and "bảo mật" in final_message.lower():
-            st.session_state.final_challenge_completed = True
+            if not st.session_state.final_challenge_completed:
+                st.session_state.final_challenge_completed = True
+                complete_challenge()
     
     # Display completion message and badge
     if st.session_state.final_challenge_completed:
         st.success("🎖️ CHÚC MỪNG! Bạn đã hoàn thành thử thách mật mã!")
-        complete_challenge()
         
         # Display final badge
         badge_data = generate_badge("Chuyên Gia Mật Mã", "#1E88E5")
@@ -657,6 +764,14 @@ def main():
     with col3:
         if st.session_state.mission_completed:
             st.markdown(f"### 🏆 {translations['mission_complete']}")
+
+    with st.sidebar.expander("📊 Tiến độ cả lớp"):
+        progress = class_progress()
+        st.markdown(f"**Số học viên:** {progress['learners']}")
+        for level, count in progress["by_level"].items():
+            st.markdown(f"- Cấp độ {level}: {count}")
+        st.markdown(f"**Thử thách trung bình:** {progress['average_challenges']:.1f}/3")
+        st.markdown(f"**Hoàn thành nhiệm vụ:** {progress['missions_completed']}")
     
     # Show animations for achievements
     if st.session_state.show_animation:
@@ -664,6 +779,17 @@ def main():
         st.balloons()
         st.session_state.show_animation = False
     
+    if debug_mode_enabled():
+        # Instrument (and optionally profile) this rerun and report it in the sidebar
+        profile_rerun = st.sidebar.checkbox("Profile lần chạy này (cProfile)", key="debug_profile")
+        profiler = instrumentation.profile() if profile_rerun else nullcontext({})
+        with instrumentation.collect() as stats, profiler as profile_result:
+            show_current_level()
+        show_debug_sidebar(stats, profile_result.get("report"))
+    else:
+        show_current_level()
+
+def show_current_level():
     # Display different content based on game level
     if st.session_state.game_level == 1:
         level_1_intro()
@@ -674,5 +800,33 @@ def main():
     elif st.session_state.game_level == 4:
         level_4_hacker_challenge()
 
+def debug_mode_enabled():
+    """The debug sidebar is shown with ?debug=1 or VIGENERE_DEBUG=1"""
+    return os.environ.get("VIGENERE_DEBUG") == "1" or st.query_params.get("debug") == "1"
+
+def show_debug_sidebar(stats, profile_report=None):
+    with st.sidebar:
+        st.header("🛠️ Debug")
+        if stats:
+            names = sorted(stats, key=lambda name: stats[name]["seconds"], reverse=True)
+            st.dataframe(
+                {
+                    "Giai đoạn": names,
+                    "Số lần gọi": [stats[name]["calls"] for name in names],
+                    "Thời gian (ms)": [stats[name]["seconds"] * 1000 for name in names],
+                    "Bytes": [stats[name]["bytes"] for name in names],
+                },
+                hide_index=True,
+            )
+        else:
+            st.caption("Không có phân tích nào chạy trong lần này.")
+        st.download_button(
+            "Tải thống kê (JSON)", instrumentation.to_json(stats),
+            file_name="instrumentation.json", mime="application/json",
+        )
+        if profile_report:
+            with st.expander("Báo cáo cProfile"):
+                st.code(profile_report)
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,138 @@
+"""
+Build-time artifacts for the challenge pages.
+
+The tabula recta, the IoC table, candidate keys and IoC chart of every
+challenge only depend on constants in challenges.py. This script computes
+them once and writes them to a versioned JSON file:
+
+    python artifacts.py [--output artifacts.json]
+
+The file records a hash of its content and a fingerprint of the inputs it
+was built from: the challenge constants and the source of the modules that
+analyze them. load() rejects it (and the app computes everything live, as
+before) when it is missing, from another format version, corrupted, or
+built from different challenge content or analysis code.
+"""
+import argparse
+import base64
+import hashlib
+import inspect
+import json
+import os
+import time
+
+import challenges
+import frequency_analysis
+import polyalphabetic
+
+# Bump when the layout of the artifact file changes
+ARTIFACT_VERSION = 1
+
+DEFAULT_ARTIFACT_PATH = os.environ.get(
+    "VIGENERE_ARTIFACTS", os.path.join(os.path.dirname(os.path.abspath(__file__)), "artifacts.json")
+)
+
+# Modules whose code produces the artifacts; editing any of them invalidates the file
+ANALYSIS_MODULES = (challenges, frequency_analysis, polyalphabetic)
+
+def _digest(value):
+    return hashlib.sha256(json.dumps(value, sort_keys=True, separators=(",", ":")).encode("utf-8")).hexdigest()
+
+def input_fingerprint():
+    """Hash of everything the artifacts are computed from."""
+    return _digest({
+        "version": ARTIFACT_VERSION,
+        "max_key_length": challenges.MAX_KEY_LENGTH,
+        "challenges": challenges.CHALLENGES,
+        "analysis_source": {
+            module.__name__: hashlib.sha256(inspect.getsource(module).encode("utf-8")).hexdigest()
+            for module in ANALYSIS_MODULES
+        },
+    })
+
+def build():
+    """
+    Compute every artifact.
+
+    Returns:
+        dict: The artifact document, ready to be written as JSON
+    """
+    content = {"tabula_recta": challenges.tabula_recta_markdown(), "challenges": {}}
+    for name in challenges.CHALLENGES:
+        analysis = challenges.analyze_challenge(name)
+        content["challenges"][name] = {
+            # JSON object keys are strings; load() turns them back into key lengths
+            "ioc": {str(length): value for length, value in analysis["ioc"].items()},
+            "candidate_keys": {str(length): key for length, key in analysis["candidate_keys"].items()},
+            "chart_png": base64.b64encode(analysis["chart_png"]).decode("ascii"),
+        }
+
+    return {
+        "version": ARTIFACT_VERSION,
+        "built_at": time.time(),
+        "input_fingerprint": input_fingerprint(),
+        "content_hash": _digest(content),
+        "content": content,
+    }
+
+def write(path=DEFAULT_ARTIFACT_PATH):
+    """Build the artifacts and write them to ``path`` atomically."""
+    document = build()
+    temporary = path + ".tmp"
+    with open(temporary, "w", encoding="utf-8") as f:
+        json.dump(document, f, ensure_ascii=False)
+    os.replace(temporary, path)
+    return document
+
+def load(path=DEFAULT_ARTIFACT_PATH):
+    """
+    Load and validate the artifact file.
+
+    Returns:
+        tuple: ``(artifacts, None)`` with the decoded artifacts, or
+        ``(None, reason)`` when the file cannot be used
+    """
+    try:
+        with open(path, encoding="utf-8") as f:
+            document = json.load(f)
+    except FileNotFoundError:
+        return None, "missing"
+    except (OSError, ValueError) as e:
+        return None, f"unreadable: {e}"
+
+    if document.get("version") != ARTIFACT_VERSION:
+        return None, f"version {document.get('version')} != {ARTIFACT_VERSION}"
+    content = document.get("content")
+    if content is None or _digest(content) != document.get("content_hash"):
+        return None, "content hash mismatch"
+    if document.get("input_fingerprint") != input_fingerprint():
+        return None, "built from different challenge content or analysis code"
+
+    artifacts = {"tabula_recta": content["tabula_recta"], "challenges": {}}
+    for name, analysis in content["challenges"].items():
+        artifacts["challenges"][name] = {
+            "ioc": {int(length): value for length, value in analysis["ioc"].items()},
+            "candidate_keys": {int(length): key for length, key in analysis["candidate_keys"].items()},
+            "chart_png": base64.b64decode(analysis["chart_png"]),
+        }
+    return artifacts, None
+
+def main():
+    parser = argparse.ArgumentParser(description="Precompute the static analysis of the challenges.")
+    parser.add_argument("--output", default=DEFAULT_ARTIFACT_PATH, help="Artifact file to write")
+    parser.add_argument("--check", action="store_true", help="Only validate an existing artifact file")
+    args = parser.parse_args()
+
+    if args.check:
+        artifacts, reason = load(args.output)
+        if artifacts is None:
+            raise SystemExit(f"{args.output}: {reason}")
+        print(f"{args.output}: valid")
+        return
+
+    start = time.perf_counter()
+    document = write(args.output)
+    print(f"Wrote {args.output} (content {document['content_hash'][:12]}) in {time.perf_counter() - start:.2f}s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,208 @@
+"""
+Avalanche-effect benchmark for hash functions.
+
+Generates thousands of single-bit (or single-character) mutations of an input,
+hashes them in a process pool and measures how many digest bits flip compared
+with the original. A good hash flips half the bits on average, with a
+binomial spread around it.
+
+    python avalanche.py "Đây là một văn bản mẫu" --count 20000
+    python avalanche.py --file data.bin --mode char --json
+"""
+import argparse
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from hashing import DEFAULT_ALGORITHMS, check_algorithms
+
+# Mutations hashed per worker task
+CHUNK_SIZE = 2000
+
+def generate_mutations(data, count, mode="bit", seed=0):
+    """
+    Describe ``count`` single-position mutations of the input.
+
+    Each mutation XORs one byte of the input with a non-zero mask: a single
+    bit for ``mode="bit"``, or the difference to another printable ASCII
+    character for ``mode="char"``.
+
+    Args:
+        data (bytes): The original input (must not be empty)
+        count (int): Number of mutations
+        mode (str): ``"bit"`` or ``"char"``
+        seed (int): Random seed, for reproducible runs
+
+    Returns:
+        tuple: ``(positions, masks)`` as NumPy arrays
+    """
+    if not data:
+        raise ValueError("Cannot mutate an empty input")
+    if count < 1:
+        raise ValueError("The number of mutations must be at least 1")
+    rng = np.random.default_rng(seed)
+    positions = rng.integers(0, len(data), size=count)
+
+    if mode == "bit":
+        masks = np.left_shift(1, rng.integers(0, 8, size=count)).astype(np.uint8)
+    elif mode == "char":
+        original = np.frombuffer(data, dtype=np.uint8)[positions].astype(np.int64)
+        # Move printable ASCII characters to another printable character,
+        # replace any other byte with a printable one
+        offsets = rng.integers(1, 95, size=count)
+        printable = (original >= 32) & (original <= 126)
+        replacement = np.where(printable, (original - 32 + offsets) % 95 + 32, 32 + offsets)
+        masks = (original ^ replacement).astype(np.uint8)
+    else:
+        raise ValueError(f"Unknown mutation mode: {mode}")
+
+    return positions, masks
+
+def _hash_mutations(data, positions, masks, algorithms):
+    """Apply each mutation to a copy of the input and hash it (runs in the workers)."""
+    buffer = bytearray(data)
+    digests = {name: bytearray() for name in algorithms}
+    for position, mask in zip(positions.tolist(), masks.tolist()):
+        buffer[position] ^= mask
+        for name in algorithms:
+            digests[name] += hashlib.new(name, buffer).digest()
+        buffer[position] ^= mask
+    return {name: bytes(value) for name, value in digests.items()}
+
+def hash_mutations(data, positions, masks, algorithms=DEFAULT_ALGORITHMS, workers=None):
+    """
+    Hash every mutation with every algorithm.
+
+    Args:
+        workers (int): Worker processes; ``1`` hashes in the current process
+
+    Returns:
+        dict: Algorithm name -> ``(count, digest_size)`` uint8 array of digests
+    """
+    algorithms = tuple(algorithms)
+    chunks = [
+        (positions[start:start + CHUNK_SIZE], masks[start:start + CHUNK_SIZE])
+        for start in range(0, len(positions), CHUNK_SIZE)
+    ]
+
+    if workers == 1:
+        parts = [_hash_mutations(data, chunk_positions, chunk_masks, algorithms)
+                 for chunk_positions, chunk_masks in chunks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            parts = list(pool.map(
+                _hash_mutations,
+                [data] * len(chunks),
+                [chunk_positions for chunk_positions, _ in chunks],
+                [chunk_masks for _, chunk_masks in chunks],
+                [algorithms] * len(chunks),
+            ))
+
+    results = {}
+    for name in algorithms:
+        digest_size = hashlib.new(name).digest_size
+        raw = b"".join(part[name] for part in parts)
+        results[name] = np.frombuffer(raw, dtype=np.uint8).reshape(-1, digest_size)
+    return results
+
+def hamming_distances(reference, digests):
+    """
+    Count the differing bits between one digest and many others.
+
+    Args:
+        reference (bytes): The digest of the original input
+        digests (numpy.ndarray): ``(count, digest_size)`` uint8 array
+
+    Returns:
+        numpy.ndarray: Number of differing bits per row
+    """
+    reference = np.frombuffer(reference, dtype=np.uint8)
+    return np.unpackbits(digests ^ reference, axis=1).sum(axis=1, dtype=np.int64)
+
+def distance_statistics(distances, digest_bits):
+    """
+    Summarize a distribution of Hamming distances.
+
+    Returns:
+        dict: Mean, variance, extremes, the ideal binomial values and a
+        histogram (flipped bits -> count) of the observed distances
+    """
+    histogram = np.bincount(distances, minlength=digest_bits + 1)
+    return {
+        "samples": int(distances.size),
+        "digest_bits": digest_bits,
+        "mean": float(distances.mean()),
+        "mean_fraction": float(distances.mean() / digest_bits),
+        "variance": float(distances.var()),
+        "std": float(distances.std()),
+        "min": int(distances.min()),
+        "max": int(distances.max()),
+        # A random oracle flips each bit independently with probability 1/2
+        "ideal_mean": digest_bits / 2,
+        "ideal_variance": digest_bits / 4,
+        "histogram": {int(bits): int(n) for bits, n in enumerate(histogram) if n},
+    }
+
+def analyze_avalanche(data, algorithms=DEFAULT_ALGORITHMS, count=10000, mode="bit", seed=0, workers=None):
+    """
+    Measure the avalanche effect of each algorithm on mutations of ``data``.
+
+    Returns:
+        dict: Algorithm name -> statistics from ``distance_statistics``
+    """
+    # Every mutation is compared bit by bit, so digests need a fixed size
+    check_algorithms(algorithms)
+    positions, masks = generate_mutations(data, count, mode, seed)
+    digests = hash_mutations(data, positions, masks, algorithms, workers)
+
+    results = {}
+    for name, mutated in digests.items():
+        reference = hashlib.new(name, data).digest()
+        distances = hamming_distances(reference, mutated)
+        results[name] = distance_statistics(distances, len(reference) * 8)
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure the avalanche effect of hash functions.")
+    parser.add_argument("text", nargs="?", default="Đây là một văn bản mẫu để kiểm tra tính chất của hàm băm.")
+    parser.add_argument("--file", help="Use the contents of a file instead of the text")
+    parser.add_argument("--count", type=int, default=10000, help="Number of mutations")
+    parser.add_argument("--mode", choices=("bit", "char"), default="bit")
+    parser.add_argument("--algorithms", default=",".join(DEFAULT_ALGORITHMS))
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", action="store_true", help="Print the full statistics as JSON")
+    args = parser.parse_args()
+
+    if args.file:
+        with open(args.file, "rb") as f:
+            data = f.read()
+    else:
+        data = args.text.encode("utf-8")
+
+    if not data:
+        parser.error("The input is empty")
+    if args.count < 1:
+        parser.error("--count must be at least 1")
+    algorithms = [name.strip() for name in args.algorithms.split(",")]
+    try:
+        check_algorithms(algorithms)
+    except ValueError as e:
+        parser.error(str(e))
+    results = analyze_avalanche(data, algorithms, args.count, args.mode, args.seed, args.workers or os.cpu_count())
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"{args.count} {args.mode} mutations of a {len(data)}-byte input")
+    print(f"{'Algorithm':<12}{'Bits':>6}{'Mean':>10}{'Mean %':>9}{'Variance':>11}{'Ideal var':>11}{'Min':>6}{'Max':>6}")
+    for name, stats in results.items():
+        print(f"{name:<12}{stats['digest_bits']:>6}{stats['mean']:>10.2f}{stats['mean_fraction'] * 100:>8.2f}%"
+              f"{stats['variance']:>11.2f}{stats['ideal_variance']:>11.2f}{stats['min']:>6}{stats['max']:>6}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,217 @@
+"""
+Benchmark suite for the cipher and analysis functions.
+
+Every benchmark runs over a grid of input sizes and key lengths and records the
+median/min time, the throughput and the peak memory allocated. Each timing is
+the mean of enough back-to-back calls to last at least 0.2 s (after a warm-up),
+so sub-millisecond cases are not timed from a single noisy call. Results are
+written as JSON and can be checked against a stored baseline:
+
+    python benchmarks.py --output results.json
+    python benchmarks.py --sizes 100,10K,1M --key-lengths 1,5,200 --baseline results.json --threshold 0.2
+
+A case that takes longer than ``--max-seconds`` stops the larger sizes of the
+same benchmark, so the full 100 B - 100 MB grid only runs as far as each
+function can go in the time budget.
+"""
+import argparse
+import json
+import platform
+import statistics
+import sys
+import timeit
+import tracemalloc
+from datetime import datetime, timezone
+
+import numpy as np
+
+from vigenere_cipher import caesar_shift, encrypt_vigenere, decrypt_vigenere
+from caesar import caesar_encrypt, crack_caesar
+from frequency_analysis import (
+    ENGLISH_FREQUENCIES,
+    calculate_frequencies,
+    calculate_index_of_coincidence,
+    analyze_vigenere_key_length,
+    break_vigenere_cipher,
+    estimate_key_lengths,
+    estimate_vigenere_key,
+)
+
+DEFAULT_SIZES = "100,1K,10K,100K,1M,10M,100M"
+DEFAULT_KEY_LENGTHS = "1,5,20,200"
+
+SIZE_SUFFIXES = {"K": 1_000, "M": 1_000_000, "G": 1_000_000_000}
+
+def parse_size(text):
+    """Parse sizes like ``100``, ``10K`` or ``100M`` into a number of bytes."""
+    text = text.strip().upper().rstrip("B")
+    if text and text[-1] in SIZE_SUFFIXES:
+        return int(float(text[:-1]) * SIZE_SUFFIXES[text[-1]])
+    return int(text)
+
+def generate_plaintext(size, seed=0):
+    """Random uppercase text with English letter frequencies."""
+    rng = np.random.default_rng(seed)
+    weights = np.array(list(ENGLISH_FREQUENCIES.values()))
+    codes = rng.choice(26, size=size, p=weights / weights.sum()).astype(np.uint8)
+    return (codes + ord('A')).tobytes().decode("ascii")
+
+def generate_key(length, seed=0):
+    rng = np.random.default_rng(seed + 1)
+    return (rng.integers(0, 26, size=length, dtype=np.uint8) + ord('A')).tobytes().decode("ascii")
+
+def vigenere_encrypt_fast(plaintext, key):
+    """Encrypt generated inputs without going through the code under test."""
+    codes = np.frombuffer(plaintext.encode("ascii"), dtype=np.uint8) - ord('A')
+    shifts = np.frombuffer(key.encode("ascii"), dtype=np.uint8) - ord('A')
+    stream = np.resize(shifts, codes.size)
+    return ((codes + stream) % 26 + ord('A')).astype(np.uint8).tobytes().decode("ascii")
+
+# name -> (uses the key length, builds the call for a given input)
+BENCHMARKS = {
+    "caesar_shift": (False, lambda text, key, cipher: lambda: [caesar_shift(c, 3) for c in text]),
+    "caesar_encrypt": (False, lambda text, key, cipher: lambda: caesar_encrypt(text, 3)),
+    "crack_caesar": (False, lambda text, key, cipher: lambda: crack_caesar(cipher)),
+    "encrypt_vigenere": (True, lambda text, key, cipher: lambda: encrypt_vigenere(text, key)),
+    "decrypt_vigenere": (True, lambda text, key, cipher: lambda: decrypt_vigenere(cipher, key)),
+    "calculate_frequencies": (False, lambda text, key, cipher: lambda: calculate_frequencies(text)),
+    "calculate_index_of_coincidence": (False, lambda text, key, cipher: lambda: calculate_index_of_coincidence(text)),
+    "analyze_vigenere_key_length": (False, lambda text, key, cipher: lambda: analyze_vigenere_key_length(cipher)),
+    "break_vigenere_cipher": (True, lambda text, key, cipher: lambda: break_vigenere_cipher(cipher, len(key))),
+    "estimate_key_lengths": (False, lambda text, key, cipher: lambda: estimate_key_lengths(cipher, verify=False)),
+    "estimate_vigenere_key": (True, lambda text, key, cipher: lambda: estimate_vigenere_key(cipher, len(key), verify=False)),
+}
+
+def measure(call, size, repeats):
+    """
+    Time a call and measure the peak memory it allocates.
+
+    Returns:
+        dict: Timing, throughput and allocation figures
+    """
+    timer = timeit.Timer(call)
+    # autorange doubles as the warm-up and finds how many calls make a 0.2 s sample
+    number, _ = timer.autorange()
+    times = [total / number for total in timer.repeat(repeat=repeats, number=number)]
+
+    # Allocation tracing slows the call down, so it gets its own run
+    tracemalloc.start()
+    call()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    median = statistics.median(times)
+    return {
+        "repeats": repeats,
+        "number": number,
+        "median_s": median,
+        "min_s": min(times),
+        "throughput_mb_s": size / median / 1e6 if median else None,
+        "peak_alloc_bytes": peak,
+    }
+
+def run(names, sizes, key_lengths, repeats, max_seconds):
+    results = []
+    for name in names:
+        uses_key, build = BENCHMARKS[name]
+        lengths = key_lengths if uses_key else [None]
+        for key_length in lengths:
+            for size in sizes:
+                text = generate_plaintext(size)
+                key = generate_key(key_length or 5)
+                cipher = vigenere_encrypt_fast(text, key)
+                call = build(text, key, cipher)
+
+                case = {"name": name, "size": size, "key_length": key_length}
+                case.update(measure(call, size, repeats if size <= 1_000_000 else 1))
+                results.append(case)
+                print(f"{name:<32} size={size:<10} key={key_length or '-':<4} "
+                      f"{case['median_s'] * 1000:10.2f} ms  {case['throughput_mb_s'] or 0:8.2f} MB/s",
+                      file=sys.stderr)
+
+                if case["median_s"] > max_seconds:
+                    print(f"{name}: skipping sizes above {size} (over {max_seconds}s)", file=sys.stderr)
+                    break
+    return results
+
+def case_id(case):
+    return f"{case['name']}[size={case['size']},key={case['key_length']}]"
+
+def compare(results, baseline, threshold, noise_floor=0.0):
+    """
+    Compare min times against a baseline.
+
+    The minimum of the samples is the least disturbed by other activity on
+    the machine, so it is what gets compared.
+
+    Args:
+        noise_floor (float): Slowdowns smaller than this many seconds are
+            ignored, whatever their ratio
+
+    Returns:
+        list: Descriptions of the cases slower than ``1 + threshold`` times the baseline
+    """
+    previous = {case_id(case): case for case in baseline["results"]}
+    regressions = []
+    for case in results:
+        old = previous.get(case_id(case))
+        if old is None:
+            continue
+        ratio = case["min_s"] / old["min_s"] if old["min_s"] else 1.0
+        if ratio > 1 + threshold and case["min_s"] - old["min_s"] > noise_floor:
+            regressions.append(f"{case_id(case)}: {old['min_s']:.6f}s -> {case['min_s']:.6f}s ({ratio:.2f}x)")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the cipher and analysis functions.")
+    parser.add_argument("--benchmarks", default=",".join(BENCHMARKS), help="Comma-separated benchmark names")
+    parser.add_argument("--sizes", default=DEFAULT_SIZES, help="Comma-separated input sizes, e.g. 100,10K,1M")
+    parser.add_argument("--key-lengths", default=DEFAULT_KEY_LENGTHS, help="Comma-separated key lengths")
+    parser.add_argument("--repeats", type=int, default=5, help="Timed samples per case (1 above 1 MB)")
+    parser.add_argument("--max-seconds", type=float, default=5.0,
+                        help="Stop growing the input of a benchmark once a case takes longer than this")
+    parser.add_argument("--output", help="Write the JSON results to this file")
+    parser.add_argument("--baseline", help="JSON results to compare against")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="Allowed slowdown relative to the baseline before failing (0.2 = 20%%)")
+    parser.add_argument("--noise-floor", type=float, default=1e-4,
+                        help="Ignore slowdowns smaller than this many seconds per call")
+    args = parser.parse_args()
+
+    names = [name.strip() for name in args.benchmarks.split(",")]
+    unknown = [name for name in names if name not in BENCHMARKS]
+    if unknown:
+        parser.error(f"Unknown benchmarks: {', '.join(unknown)}")
+
+    sizes = [parse_size(size) for size in args.sizes.split(",")]
+    key_lengths = [int(length) for length in args.key_lengths.split(",")]
+
+    report = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "numpy": np.__version__,
+        },
+        "results": run(names, sizes, key_lengths, args.repeats, args.max_seconds),
+    }
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output)
+    else:
+        print(output)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            regressions = compare(report["results"], json.load(f), args.threshold, args.noise_floor)
+        if regressions:
+            print("Performance regressions:", file=sys.stderr)
+            for line in regressions:
+                print(f"  {line}", file=sys.stderr)
+            sys.exit(1)
+        print("No regressions against the baseline.", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""
+Bulk Caesar cipher and an all-shift cracker.
+
+Encryption and decryption go through 26 precomputed translation tables, so
+a whole buffer is shifted by a single ``translate`` call. Letters keep their
+case and everything else is left untouched.
+
+Cracking needs only the 26 letter counts of the ciphertext: decrypting with
+shift ``s`` just relabels the counts, so every shift is scored against
+English letter frequencies from the same count vector:
+
+    from caesar import caesar_encrypt, crack_caesar
+    shift, plaintext, score = crack_caesar(caesar_encrypt("Attack at dawn", 3))
+"""
+import string
+
+import numpy as np
+
+from frequency_analysis import score_shifts
+
+def _shifted_alphabet(shift):
+    upper = string.ascii_uppercase[shift:] + string.ascii_uppercase[:shift]
+    lower = string.ascii_lowercase[shift:] + string.ascii_lowercase[:shift]
+    return upper + lower
+
+_LETTERS = string.ascii_uppercase + string.ascii_lowercase
+
+# ENCRYPT_TABLES[s] shifts letters forward by s; decryption uses the table of -s
+ENCRYPT_TABLES = [
+    bytes.maketrans(_LETTERS.encode('ascii'), _shifted_alphabet(shift).encode('ascii')) for shift in range(26)
+]
+# Tables for str.translate, used for text with non-ASCII characters
+_STR_TABLES = [str.maketrans(_LETTERS, _shifted_alphabet(shift)) for shift in range(26)]
+
+# Bytes counted per bincount call; small chunks keep the intp copy in cache
+COUNT_CHUNK_SIZE = 1 << 18
+
+def caesar_encrypt(data, shift):
+    """
+    Shift every ASCII letter of a text or buffer.
+
+    Args:
+        data (str or bytes): The text to encrypt
+        shift (int): The shift (any integer, taken modulo 26)
+
+    Returns:
+        str or bytes: The encrypted text, of the same type as ``data``
+    """
+    shift %= 26
+    if isinstance(data, str):
+        if data.isascii():
+            return data.encode('ascii').translate(ENCRYPT_TABLES[shift]).decode('ascii')
+        return data.translate(_STR_TABLES[shift])
+    return bytes(data).translate(ENCRYPT_TABLES[shift])
+
+def caesar_decrypt(data, shift):
+    """Undo caesar_encrypt with the same shift."""
+    return caesar_encrypt(data, -shift)
+
+def letter_counts(data):
+    """
+    Count each ASCII letter (case-insensitive) of a text or buffer.
+
+    Returns:
+        numpy.ndarray: 26 counts, A to Z
+    """
+    if isinstance(data, str):
+        data = data.encode('ascii', 'ignore')
+    buffer = np.frombuffer(data, dtype=np.uint8)
+    byte_counts = np.zeros(256, dtype=np.int64)
+    for start in range(0, buffer.size, COUNT_CHUNK_SIZE):
+        byte_counts += np.bincount(buffer[start:start + COUNT_CHUNK_SIZE], minlength=256)
+    return _fold_cases(byte_counts)
+
+def _fold_cases(byte_counts):
+    # Byte value histogram(s) -> counts of A-Z, upper and lower case together
+    return byte_counts[..., ord('A'):ord('Z') + 1] + byte_counts[..., ord('a'):ord('z') + 1]
+
+def crack_caesar(ciphertext):
+    """
+    Find the shift whose decryption looks most like English.
+
+    Args:
+        ciphertext (str or bytes): The text to crack
+
+    Returns:
+        tuple: (shift, decrypted text, chi-squared score)
+    """
+    scores = score_shifts(letter_counts(ciphertext))
+    # argmin keeps the first of equal scores, like break_vigenere_cipher
+    shift = int(scores.argmin())
+    return shift, caesar_decrypt(ciphertext, shift), float(scores[shift])
+
+def crack_caesar_batch(ciphertexts):
+    """
+    Crack many ciphertexts at once.
+
+    All bytes are counted with a single ``bincount`` and every shift of
+    every ciphertext is scored in one array operation.
+
+    Args:
+        ciphertexts (list): Texts (str or bytes)
+
+    Returns:
+        tuple: ``(shifts, scores)`` NumPy arrays with one entry per ciphertext
+    """
+    parts = [
+        np.frombuffer(text.encode('ascii', 'ignore') if isinstance(text, str) else text, dtype=np.uint8)
+        for text in ciphertexts
+    ]
+    owner = np.repeat(np.arange(len(parts)), [part.size for part in parts])
+    codes = np.concatenate(parts) if parts else np.zeros(0, dtype=np.uint8)
+    byte_counts = np.bincount(owner * 256 + codes, minlength=len(parts) * 256).reshape(len(parts), 256)
+    counts = _fold_cases(byte_counts)
+
+    scores = score_shifts(counts)
+    shifts = scores.argmin(axis=1)
+    return shifts, scores[np.arange(len(parts)), shifts]
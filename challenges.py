@@ -0,0 +1,101 @@
+"""
+Static content of the challenges and the analysis derived from it.
+
+Everything here only depends on the constants below, so artifacts.py can
+compute it once at build time instead of on every page load.
+"""
+import io
+
+import matplotlib.pyplot as plt
+
+from frequency_analysis import analyze_vigenere_key_length, break_vigenere_cipher
+
+# Longest key length analyzed and offered in the challenges
+MAX_KEY_LENGTH = 15
+
+# Intercepted message of level 3
+EXAMPLE_CIPHER = "LWSSUCMZXMGZTTZSUOAXZWBHGWOMHXQVTVPVGAGZHTVTVVSMKFMTVIKHRZTWWWPMLZLGMXEOAGZJGMSMHMVCSWTXQVTVPBKHRZXWIIMATRVMPLRPV"
+
+# Final message of level 4
+FINAL_CIPHER = "PZSVYMFCCKIQXSZWRLFWOZGIILSWVMBZPESJLVYYVHWPIKBCMBGPLYPCDZMFOWVSLRLLRYCAZCKIQXSZRDAFDRVHZBQHYYVHWPIUBCWVDRLQMLVDEBVVBDTZWRLVVBDSEXZIGOEHQTVLWIMYWMDIFGGEIGGZRFBBX"
+
+# Ciphertext and IoC chart labels of each challenge
+CHALLENGES = {
+    "example": {
+        "ciphertext": EXAMPLE_CIPHER,
+        "title": 'Chỉ số trùng khớp cho các độ dài khóa khác nhau',
+        "ylabel": 'Chỉ số trùng khớp (Index of Coincidence)',
+        "expected_label": 'Dự kiến cho tiếng Anh (Expected for English)',
+    },
+    "final": {
+        "ciphertext": FINAL_CIPHER,
+        "title": 'Chỉ số trùng khớp cho mật mã cuối cùng',
+        "ylabel": 'Chỉ số trùng khớp (IoC)',
+        "expected_label": 'Dự kiến cho tiếng Anh',
+    },
+}
+
+def tabula_recta_markdown():
+    """
+    Render the Vigenère square as a markdown code block.
+
+    Returns:
+        str: 26 rows of 26 letters under a header row
+    """
+    alphabet = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+    lines = ["```", "   " + " ".join(alphabet), "  +" + "-" * 51]
+    for i, letter in enumerate(alphabet):
+        shifted = alphabet[i:] + alphabet[:i]
+        lines.append(letter + " | " + " ".join(shifted) + " ")
+    return "\n".join(lines) + "\n```"
+
+def render_ioc_chart(scores, title, ylabel, expected_label):
+    """
+    Draw the IoC of each key length as a bar chart.
+
+    Args:
+        scores (dict): Key length -> IoC
+        title (str): Chart title
+        ylabel (str): Y axis label
+        expected_label (str): Legend of the English IoC line
+
+    Returns:
+        bytes: The chart as a PNG image
+    """
+    fig, ax = plt.subplots(figsize=(10, 5))
+    key_lengths = list(scores.keys())
+    index_values = list(scores.values())
+
+    ax.bar(key_lengths, index_values, color='skyblue')
+    ax.set_xlabel('Độ dài khóa (Key Length)')
+    ax.set_ylabel(ylabel)
+    ax.set_title(title)
+    ax.set_xticks(key_lengths)
+    ax.grid(axis='y', linestyle='--', alpha=0.7)
+    ax.axhline(y=0.067, color='r', linestyle='-', alpha=0.7, label=expected_label)
+    ax.legend()
+
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format="png", dpi=150, bbox_inches="tight")
+    plt.close(fig)
+    return buffer.getvalue()
+
+def analyze_challenge(name):
+    """
+    Compute the IoC table, the candidate key of every key length and the
+    IoC chart of a challenge.
+
+    Returns:
+        dict: ``ioc`` and ``candidate_keys`` (keyed by key length) and
+        ``chart_png`` (PNG bytes)
+    """
+    challenge = CHALLENGES[name]
+    ioc = analyze_vigenere_key_length(challenge["ciphertext"], max_length=MAX_KEY_LENGTH)
+    return {
+        "ioc": ioc,
+        "candidate_keys": {
+            key_length: break_vigenere_cipher(challenge["ciphertext"], key_length)[1]
+            for key_length in range(1, MAX_KEY_LENGTH + 1)
+        },
+        "chart_png": render_ioc_chart(ioc, challenge["title"], challenge["ylabel"], challenge["expected_label"]),
+    }
@@ -0,0 +1,333 @@
+"""
+Reproducible Vigenère workloads for benchmarking and solver accuracy.
+
+Generate a dataset of plaintexts drawn from a corpus (or from a seeded
+character Markov model trained on it), encrypted with random keys of
+controlled lengths:
+
+    python corpus_generator.py generate dataset.jsonl.gz --count 20 \\
+        --lengths 50,100,200,500,1000 --key-lengths 3,5,8,12 --source markov --seed 1
+
+Then measure how often each solver recovers the key, by ciphertext length
+and key length, and how long it takes:
+
+    python corpus_generator.py evaluate dataset.jsonl.gz --solvers ioc-chi2,known-length
+
+Datasets are JSON Lines (gzip-compressed when the name ends in ``.gz``), one
+record per sample with its seed, ground-truth key, plaintext and ciphertext.
+"""
+import argparse
+import gzip
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from vigenere_cipher import encrypt_vigenere
+from frequency_analysis import analyze_vigenere_key_length, break_vigenere_cipher, crack_vigenere, near_best_lengths
+from polyalphabetic import to_codes
+
+DEFAULT_CORPUS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "corpora", "english.txt")
+
+def load_corpus(path=DEFAULT_CORPUS):
+    """
+    Load a text corpus as uppercase letters only.
+
+    Returns:
+        str: The normalized corpus
+    """
+    with open(path, encoding="utf-8") as f:
+        codes = to_codes(f.read())
+    return (codes + ord('A')).tobytes().decode("ascii")
+
+class MarkovModel:
+    """
+    Character-level Markov model over the letters A-Z.
+
+    Args:
+        text (str): Normalized training text (uppercase letters only)
+        order (int): Number of previous letters the next one depends on
+    """
+
+    def __init__(self, text, order=3):
+        if len(text) <= order:
+            raise ValueError("Training text must be longer than the model order")
+        self.order = order
+        self.contexts = sorted({text[i:i + order] for i in range(len(text) - order)})
+        index = {context: i for i, context in enumerate(self.contexts)}
+
+        counts = np.zeros((len(self.contexts), 26))
+        for i in range(len(text) - order):
+            counts[index[text[i:i + order]], ord(text[i + order]) - ord('A')] += 1
+        self.index = index
+        self.probabilities = np.cumsum(counts / counts.sum(axis=1, keepdims=True), axis=1)
+
+    def generate(self, length, rng):
+        """
+        Sample ``length`` letters from the model.
+
+        Args:
+            length (int): Number of letters
+            rng (numpy.random.Generator): Source of randomness
+
+        Returns:
+            str: The generated text
+        """
+        context = self.contexts[rng.integers(len(self.contexts))]
+        letters = list(context)
+        draws = rng.random(length)
+        for draw in draws[:max(0, length - self.order)]:
+            row = self.index.get(context)
+            if row is None:
+                # Dead end (context only seen at the end of the corpus): restart anywhere
+                context = self.contexts[rng.integers(len(self.contexts))]
+                row = self.index[context]
+            letter = chr(ord('A') + min(int(np.searchsorted(self.probabilities[row], draw)), 25))
+            letters.append(letter)
+            context = context[1:] + letter
+        return "".join(letters[:length])
+
+_worker_state = {}
+
+def _init_worker(corpus_path, source, order):
+    corpus = load_corpus(corpus_path)
+    _worker_state["corpus"] = corpus
+    _worker_state["model"] = MarkovModel(corpus, order) if source == "markov" else None
+
+def _generate_sample(spec):
+    sample_id, seed, length, key_length = spec
+    rng = np.random.default_rng(seed)
+
+    if _worker_state["model"] is not None:
+        plaintext = _worker_state["model"].generate(length, rng)
+    else:
+        # A random window of the corpus, wrapping around if it is too short
+        corpus = _worker_state["corpus"]
+        start = int(rng.integers(len(corpus)))
+        repeated = corpus * (length // len(corpus) + 2)
+        plaintext = repeated[start:start + length]
+
+    key = (rng.integers(0, 26, size=key_length, dtype=np.uint8) + ord('A')).tobytes().decode("ascii")
+    return {
+        "id": sample_id,
+        "seed": seed,
+        "length": length,
+        "key_length": key_length,
+        "key": key,
+        "plaintext": plaintext,
+        "ciphertext": encrypt_vigenere(plaintext, key),
+    }
+
+def generate_dataset(count, lengths, key_lengths, source="corpus", seed=0, workers=None,
+                     corpus_path=DEFAULT_CORPUS, order=3):
+    """
+    Generate ``count`` samples for every (length, key length) combination.
+
+    Each sample has its own seed derived from ``seed``, so the dataset is the
+    same whatever the number of workers.
+
+    Args:
+        count (int): Samples per combination
+        lengths (list): Plaintext lengths in letters
+        key_lengths (list): Key lengths
+        source (str): ``"corpus"`` (windows of the corpus) or ``"markov"``
+        seed (int): Base seed
+        workers (int): Worker processes
+        corpus_path (str): Training/source text
+        order (int): Markov model order
+
+    Returns:
+        list: Sample records
+    """
+    if source not in ("corpus", "markov"):
+        raise ValueError(f"Unknown plaintext source: {source}")
+
+    seeds = np.random.SeedSequence(seed).generate_state(count * len(lengths) * len(key_lengths))
+    specs = []
+    for length in lengths:
+        for key_length in key_lengths:
+            for _ in range(count):
+                specs.append((len(specs), int(seeds[len(specs)]), length, key_length))
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(corpus_path, source, order)) as pool:
+        return list(pool.map(_generate_sample, specs, chunksize=max(1, len(specs) // 64)))
+
+def _open(path, mode):
+    if path.endswith(".gz"):
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+def write_dataset(records, path, include_plaintext=True):
+    with _open(path, "w") as f:
+        for record in records:
+            if not include_plaintext:
+                record = {name: value for name, value in record.items() if name != "plaintext"}
+            f.write(json.dumps(record, separators=(",", ":")) + "\n")
+
+def read_dataset(path):
+    with _open(path, "r") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+def guess_key_length(ciphertext, max_length=20, tolerance=0.9):
+    """Pick the shortest key length whose IoC is close to the best one (see near_best_lengths)."""
+    return (near_best_lengths(analyze_vigenere_key_length(ciphertext, max_length), tolerance) or [1])[0]
+
+def solve_ioc_chi2(record, max_length=20):
+    """Guess the key length from the IoC, then solve each column by chi-squared."""
+    key_length = guess_key_length(record["ciphertext"], max_length)
+    return break_vigenere_cipher(record["ciphertext"], key_length)[1]
+
+def solve_known_length(record, max_length=20):
+    """Solve the columns with the true key length (measures the column step alone)."""
+    return break_vigenere_cipher(record["ciphertext"], record["key_length"])[1]
+
+def solve_confidence(record, max_length=20):
+    """Try key lengths in IoC order until a decryption is confidently English."""
+    return crack_vigenere(record["ciphertext"], max_length)[1]
+
+SOLVERS = {
+    "ioc-chi2": solve_ioc_chi2,
+    "known-length": solve_known_length,
+    "confidence": solve_confidence,
+}
+
+def _minimal_period(key):
+    for period in range(1, len(key) + 1):
+        if len(key) % period == 0 and key[:period] * (len(key) // period) == key:
+            return key[:period]
+    return key
+
+def _evaluate_record(args):
+    solver_name, record, max_length = args
+    start = time.perf_counter()
+    try:
+        key = SOLVERS[solver_name](record, max_length)
+    except Exception as e:
+        # Counted apart from wrong keys: a crash is a solver bug, not a miss
+        key, error = None, f"{type(e).__name__}: {e}"
+    else:
+        error = None
+    elapsed = time.perf_counter() - start
+    # A repeated key ("KEYKEY") decrypts exactly like the key itself
+    solved = key is not None and _minimal_period(key) == _minimal_period(record["key"])
+    return solver_name, record["length"], record["key_length"], solved, error, elapsed
+
+def evaluate(records, solvers=tuple(SOLVERS), max_length=20, workers=1):
+    """
+    Measure crack rate and time of each solver by ciphertext and key length.
+
+    Args:
+        records (iterable): Dataset records
+        solvers (iterable): Names from SOLVERS
+        max_length (int): Longest key length the solvers consider
+        workers (int): Worker processes (1 keeps timings free of contention)
+
+    Returns:
+        list: One dict per (solver, length, key length) with the sample count,
+        crack rate, mean/max seconds, and the number of samples on which the
+        solver raised with the first such ``error`` message (None if none)
+    """
+    records = list(records)
+    tasks = [(solver, record, max_length) for solver in solvers for record in records]
+
+    if workers == 1:
+        outcomes = map(_evaluate_record, tasks)
+    else:
+        pool = ProcessPoolExecutor(max_workers=workers)
+        outcomes = pool.map(_evaluate_record, tasks, chunksize=max(1, len(tasks) // 64))
+
+    cells = {}
+    for solver, length, key_length, solved, error, elapsed in outcomes:
+        cell = cells.setdefault((solver, length, key_length),
+                                {"samples": 0, "solved": 0, "errors": 0, "error": None, "times": []})
+        cell["samples"] += 1
+        cell["solved"] += solved
+        cell["times"].append(elapsed)
+        if error is not None:
+            cell["errors"] += 1
+            cell["error"] = cell["error"] or error
+
+    if workers != 1:
+        pool.shutdown()
+
+    return [
+        {
+            "solver": solver,
+            "length": length,
+            "key_length": key_length,
+            "samples": cell["samples"],
+            "crack_rate": cell["solved"] / cell["samples"],
+            "mean_seconds": float(np.mean(cell["times"])),
+            "max_seconds": float(np.max(cell["times"])),
+            "errors": cell["errors"],
+            "error": cell["error"],
+        }
+        for (solver, length, key_length), cell in sorted(cells.items())
+    ]
+
+def _int_list(text):
+    return [int(value) for value in text.split(",")]
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate Vigenère datasets and evaluate solvers on them.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    generate = commands.add_parser("generate", help="Write a dataset")
+    generate.add_argument("output", help="Dataset file (.jsonl or .jsonl.gz)")
+    generate.add_argument("--count", type=int, default=10, help="Samples per length/key length pair")
+    generate.add_argument("--lengths", type=_int_list, default=[50, 100, 200, 500, 1000])
+    generate.add_argument("--key-lengths", type=_int_list, default=[3, 5, 8, 12])
+    generate.add_argument("--source", choices=("corpus", "markov"), default="corpus")
+    generate.add_argument("--corpus", default=DEFAULT_CORPUS)
+    generate.add_argument("--order", type=int, default=3, help="Markov model order")
+    generate.add_argument("--seed", type=int, default=0)
+    generate.add_argument("--workers", type=int, default=None)
+    generate.add_argument("--no-plaintext", action="store_true", help="Leave the plaintexts out of the file")
+
+    run = commands.add_parser("evaluate", help="Measure solver crack rates on a dataset")
+    run.add_argument("dataset")
+    run.add_argument("--solvers", default=",".join(SOLVERS))
+    run.add_argument("--max-length", type=int, default=20, help="Longest key length the solvers try")
+    run.add_argument("--workers", type=int, default=1)
+    run.add_argument("--json", action="store_true")
+
+    args = parser.parse_args()
+
+    if args.command == "generate":
+        start = time.perf_counter()
+        records = generate_dataset(args.count, args.lengths, args.key_lengths, args.source, args.seed,
+                                   args.workers, args.corpus, args.order)
+        write_dataset(records, args.output, include_plaintext=not args.no_plaintext)
+        print(f"Wrote {len(records)} samples to {args.output} in {time.perf_counter() - start:.2f}s")
+        return
+
+    solvers = [name.strip() for name in args.solvers.split(",")]
+    unknown = [name for name in solvers if name not in SOLVERS]
+    if unknown:
+        parser.error(f"Unknown solvers: {', '.join(unknown)}")
+
+    results = evaluate(read_dataset(args.dataset), solvers, args.max_length, args.workers)
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print(f"{'Solver':<14}{'Length':>8}{'Key':>5}{'Samples':>9}{'Cracked':>9}{'Errors':>8}"
+              f"{'Mean ms':>10}{'Max ms':>10}")
+        for row in results:
+            print(f"{row['solver']:<14}{row['length']:>8}{row['key_length']:>5}{row['samples']:>9}"
+                  f"{row['crack_rate']:>8.0%} {row['errors']:>8}"
+                  f"{row['mean_seconds'] * 1000:>10.2f}{row['max_seconds'] * 1000:>10.2f}")
+
+    failed = [row for row in results if row["errors"]]
+    for row in failed:
+        print(f"{row['solver']} (length {row['length']}, key length {row['key_length']}): "
+              f"{row['errors']} errors, first: {row['error']}", file=sys.stderr)
+    sys.exit(1 if failed else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,207 @@
+"""
+Find duplicate files and MD5 collisions in large directory trees.
+
+Files are narrowed down in stages so most of them are never read in full:
+
+1. group by size (from the directory listing, no reads),
+2. group by a cheap partial hash of the first and last few KiB,
+3. group by full MD5, hashed together with SHA-256 in the same read pass,
+4. split each MD5 group by SHA-256: identical SHA-256 means a true
+   duplicate, different SHA-256 under one MD5 is an MD5 collision, reported
+   with the offsets of the differing bytes.
+
+Colliding files have different contents, so the partial hash would separate
+them before stage 3. With ``--collisions`` stage 2 is skipped and every file
+sharing its size with another is fully hashed, which finds collisions at the
+cost of reading those files completely.
+
+    python duplicate_finder.py DIR [...] [--workers 16] [--collisions] [--json]
+"""
+import argparse
+import hashlib
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from hashing import hash_files
+from hash_index import scan
+
+# Bytes read from each end of a file for the partial hash
+PARTIAL_SIZE = 4096
+
+# Chunk size when comparing two files byte by byte
+COMPARE_CHUNK_SIZE = 1024 * 1024
+
+def partial_hash(path, size):
+    """Hash the first and last PARTIAL_SIZE bytes of a file."""
+    hasher = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        hasher.update(f.read(PARTIAL_SIZE))
+        if size > PARTIAL_SIZE:
+            f.seek(max(PARTIAL_SIZE, size - PARTIAL_SIZE))
+            hasher.update(f.read(PARTIAL_SIZE))
+    return hasher.hexdigest()
+
+def diff_offsets(path_a, path_b, limit=100):
+    """
+    Compare two files and locate their differing bytes.
+
+    Args:
+        path_a (str): First file
+        path_b (str): Second file
+        limit (int): Maximum number of differences listed
+
+    Returns:
+        dict: Total number of differing bytes and up to ``limit`` of them as
+        ``(offset, byte_a, byte_b)``
+    """
+    count = 0
+    differences = []
+    offset = 0
+    with open(path_a, "rb") as fa, open(path_b, "rb") as fb:
+        while True:
+            chunk_a = fa.read(COMPARE_CHUNK_SIZE)
+            chunk_b = fb.read(COMPARE_CHUNK_SIZE)
+            if not chunk_a and not chunk_b:
+                break
+            common = min(len(chunk_a), len(chunk_b))
+            a = np.frombuffer(chunk_a, dtype=np.uint8, count=common)
+            b = np.frombuffer(chunk_b, dtype=np.uint8, count=common)
+            positions = np.flatnonzero(a != b)
+            count += positions.size + abs(len(chunk_a) - len(chunk_b))
+            for position in positions[:max(0, limit - len(differences))].tolist():
+                differences.append((offset + position, chunk_a[position], chunk_b[position]))
+            offset += common
+            if len(chunk_a) != len(chunk_b):
+                break
+    return {"differing_bytes": count, "differences": differences}
+
+def _group(items, key):
+    groups = {}
+    for item in items:
+        groups.setdefault(key(item), []).append(item)
+    return [group for group in groups.values() if len(group) > 1]
+
+def find_duplicates(roots, workers=None, collisions=False, diff_limit=100):
+    """
+    Find groups of identical files and MD5 collisions below the given roots.
+
+    Args:
+        roots (iterable): Directories or files to scan
+        workers (int): Number of threads reading files
+        collisions (bool): Skip the partial hash stage so that files with
+            different contents but the same MD5 are found as well
+        diff_limit (int): Differences listed per colliding pair
+
+    Returns:
+        dict: ``duplicates`` (lists of identical paths), ``md5_collisions``
+        and ``stats`` with the number of files handled at each stage
+    """
+    stats = {"files": 0, "size_candidates": 0, "partial_candidates": 0, "fully_hashed": 0}
+
+    files = []
+    seen_inodes = set()
+    for root in roots:
+        for path, st in scan(root):
+            # Hard links to the same inode are not duplicate copies
+            inode = (st.st_dev, st.st_ino)
+            if inode in seen_inodes:
+                continue
+            seen_inodes.add(inode)
+            files.append((path, st.st_size))
+    stats["files"] = len(files)
+
+    duplicates = []
+    by_size = _group(files, key=lambda item: item[1])
+    candidates = []
+    for group in by_size:
+        if group[0][1] == 0:
+            # Empty files are trivially identical
+            duplicates.append(sorted(path for path, _ in group))
+        else:
+            candidates.extend(group)
+    stats["size_candidates"] = len(candidates)
+
+    if collisions:
+        to_hash = [path for path, _ in candidates]
+    else:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            partials = list(pool.map(lambda item: _safe(partial_hash, *item), candidates))
+        by_partial = _group(
+            [(path, size, partial) for (path, size), partial in zip(candidates, partials) if partial is not None],
+            key=lambda item: (item[1], item[2]),
+        )
+        to_hash = [path for group in by_partial for path, _, _ in group]
+    stats["partial_candidates"] = len(to_hash)
+
+    full = {
+        path: digests
+        for path, digests in hash_files(to_hash, ("md5", "sha256"), workers)
+        if not isinstance(digests, OSError)
+    }
+    stats["fully_hashed"] = len(full)
+
+    md5_collisions = []
+    for group in _group(full.items(), key=lambda item: item[1]["md5"]):
+        variants = {}
+        for path, digests in group:
+            variants.setdefault(digests["sha256"], []).append(path)
+        for paths in variants.values():
+            if len(paths) > 1:
+                duplicates.append(sorted(paths))
+        if len(variants) > 1:
+            representatives = [paths[0] for paths in variants.values()]
+            md5_collisions.append({
+                "md5": group[0][1]["md5"],
+                "variants": [{"sha256": sha256, "paths": sorted(paths)} for sha256, paths in variants.items()],
+                "diffs": [
+                    {"a": representatives[0], "b": other, **diff_offsets(representatives[0], other, diff_limit)}
+                    for other in representatives[1:]
+                ],
+            })
+
+    duplicates.sort()
+    return {"duplicates": duplicates, "md5_collisions": md5_collisions, "stats": stats}
+
+def _safe(func, *args):
+    try:
+        return func(*args)
+    except OSError:
+        return None
+
+def main():
+    parser = argparse.ArgumentParser(description="Find duplicate files and MD5 collisions.")
+    parser.add_argument("roots", nargs="+", help="Directories or files to scan")
+    parser.add_argument("--workers", type=int, default=None, help="Number of reading threads")
+    parser.add_argument("--collisions", action="store_true",
+                        help="Fully hash all same-size files to also find MD5 collisions")
+    parser.add_argument("--diff-limit", type=int, default=20, help="Differing bytes listed per collision")
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+
+    result = find_duplicates(args.roots, args.workers, args.collisions, args.diff_limit)
+
+    if args.json:
+        print(json.dumps(result, indent=2))
+        return
+
+    stats = result["stats"]
+    print(f"{stats['files']} files, {stats['size_candidates']} with a shared size, "
+          f"{stats['partial_candidates']} with a shared partial hash, {stats['fully_hashed']} fully hashed")
+
+    print(f"\n{len(result['duplicates'])} groups of duplicates:")
+    for group in result["duplicates"]:
+        print("  " + "\n  ".join(group) + "\n")
+
+    for collision in result["md5_collisions"]:
+        print(f"MD5 collision {collision['md5']}:")
+        for variant in collision["variants"]:
+            print(f"  SHA-256 {variant['sha256']}: {', '.join(variant['paths'])}")
+        for diff in collision["diffs"]:
+            print(f"  {diff['a']} vs {diff['b']}: {diff['differing_bytes']} differing bytes")
+            for offset, byte_a, byte_b in diff["differences"]:
+                print(f"    offset {offset}: {byte_a} != {byte_b}")
+
+if __name__ == "__main__":
+    main()
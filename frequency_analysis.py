@@ -1,6 +1,14 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from statistics import NormalDist
+
 import numpy as np
 import matplotlib.pyplot as plt
 
+from instrumentation import instrumented, stage
+from polyalphabetic import VARIANTS, to_codes, from_codes, decrypt_codes
+
 # English letter frequencies (approximate)
 ENGLISH_FREQUENCIES = {
     'A': 0.0817, 'B': 0.0149, 'C': 0.0278, 'D': 0.0425, 'E': 0.1270, 'F': 0.0223,
@@ -10,6 +18,28 @@ ENGLISH_FREQUENCIES = {
     'Y': 0.0197, 'Z': 0.0007
 }
 
+_EXPECTED = np.array(list(ENGLISH_FREQUENCIES.values()))
+
+# Plaintext letter p decrypted with shift s comes from ciphertext letter p + s
+_SOURCE = (np.arange(26)[None, :] + np.arange(26)[:, None]) % 26
+
+def score_shifts(counts):
+    """
+    Chi-squared of the decrypted letter frequencies against English, for every shift.
+    
+    Args:
+        counts (numpy.ndarray): Letter counts, shape ``(26,)`` or ``(n, 26)``
+        
+    Returns:
+        numpy.ndarray: Scores of shifts 0-25 (lower is more English), shape
+        ``(26,)`` or ``(n, 26)``
+    """
+    counts = np.asarray(counts, dtype=float)
+    frequencies = counts / np.maximum(counts.sum(axis=-1, keepdims=True), 1)
+    decrypted = frequencies[..., _SOURCE]
+    return ((decrypted - _EXPECTED) ** 2 / _EXPECTED).sum(axis=-1)
+
+@instrumented
 def calculate_frequencies(text):
     """
     Calculate the frequency of each letter in the text.
@@ -72,6 +102,7 @@ def plot_frequencies(frequencies, title="Letter Frequencies"):
     
     return fig
 
+@instrumented
 def calculate_index_of_coincidence(text):
     """
     Calculate the index of coincidence for a text.
@@ -107,7 +138,8 @@ def calculate_index_of_coincidence(text):
     
     return ic
 
-def analyze_vigenere_key_length(ciphertext, max_length=20):
+@instrumented
+def analyze_vigenere_key_length(ciphertext, max_length=20, workers=None, approximate=False, seed=0):
     """
     Analyze a Vigenère ciphertext to find the most likely key length
     using the index of coincidence.
@@ -115,12 +147,26 @@ def analyze_vigenere_key_length(ciphertext, max_length=20):
     Args:
         ciphertext (str): The ciphertext to analyze
         max_length (int): Maximum key length to consider
+        workers (int, optional): Analyze in this many worker processes sharing
+            the ciphertext through shared memory. Meant for very large
+            ciphertexts; letters are normalized with polyalphabetic.to_codes
+            in this mode.
+        approximate (bool): Estimate the IoC from random samples of each
+            residue class (see estimate_key_lengths, which also reports
+            confidence intervals). Meant for interactive use on huge inputs.
+        seed (int): Random seed of the approximate mode
         
     Returns:
         dict: A dictionary with key lengths and their IoC scores
     """
+    if approximate:
+        return estimate_key_lengths(ciphertext, max_length, seed=seed)["ioc"]
+    if workers is not None:
+        return _analyze_key_length_parallel(ciphertext, max_length, workers)
+    
     # Normalize input
-    ciphertext = ''.join(c.upper() for c in ciphertext if c.isalpha())
+    with stage("analyze.normalize", len(ciphertext)):
+        ciphertext = ''.join(c.upper() for c in ciphertext if c.isalpha())
     
     # Limit max_length to the length of the ciphertext
     max_length = min(max_length, len(ciphertext) // 2)
@@ -130,71 +176,503 @@ def analyze_vigenere_key_length(ciphertext, max_length=20):
     # Try different key lengths
     for key_length in range(1, max_length + 1):
         # Split the ciphertext into 'key_length' groups
-        groups = [''] * key_length
-        
-        for i, char in enumerate(ciphertext):
-            groups[i % key_length] += char
+        with stage("analyze.group", len(ciphertext)):
+            groups = [''] * key_length
+            
+            for i, char in enumerate(ciphertext):
+                groups[i % key_length] += char
         
         # Calculate the average IoC for all groups
-        total_ic = 0
-        for group in groups:
-            total_ic += calculate_index_of_coincidence(group)
+        with stage("analyze.count", len(ciphertext)):
+            total_ic = 0
+            for group in groups:
+                total_ic += calculate_index_of_coincidence(group)
         
         avg_ic = total_ic / key_length
         results[key_length] = avg_ic
     
     return results
 
-def break_vigenere_cipher(ciphertext, key_length):
+def near_best_lengths(scores, tolerance=0.9):
+    """
+    List the key lengths whose IoC is within tolerance of the best one.
+    
+    Multiples of the true length score as high as the length itself, so the
+    shortest of these is the most likely key length.
+    
+    Args:
+        scores (dict): Key length -> IoC, as from analyze_vigenere_key_length
+        tolerance (float): Fraction of the best IoC a length must reach
+        
+    Returns:
+        list: The near-best key lengths, shortest first (empty without scores)
+    """
+    if not scores:
+        return []
+    best = max(scores.values())
+    return [length for length in sorted(scores) if scores[length] >= tolerance * best]
+
+@instrumented
+def break_vigenere_cipher(ciphertext, key_length, progress_callback=None, approximate=False, seed=0, verify=True):
     """
     Attempt to break a Vigenère cipher when the key length is known.
     
     Args:
-        ciphertext (str): The ciphertext to break
+        ciphertext (str or numpy.ndarray): The ciphertext to break, or its
+            letter codes (from polyalphabetic.to_codes)
         key_length (int): The length of the key
+        progress_callback (callable, optional): Called as
+            ``progress_callback(done, total)`` after each key position is
+            solved. It may raise to abort the analysis.
+        approximate (bool): Choose each key letter from random samples of
+            its residue class (see estimate_vigenere_key)
+        seed (int): Random seed of the approximate mode
+        verify (bool): In the approximate mode, check the sampled key
+            against the exact letter counts and use the exact key if they
+            disagree
         
     Returns:
         tuple: (decrypted_text, discovered_key)
     """
     # Normalize input
-    ciphertext = ''.join(c.upper() for c in ciphertext if c.isalpha())
+    with stage("break.normalize", len(ciphertext)):
+        codes = _as_codes(ciphertext)
+    
+    if approximate:
+        estimate = estimate_vigenere_key(codes, key_length, seed=seed, verify=verify)
+        discovered_key = estimate["exact_key"] if verify and not estimate["verified"] else estimate["key"]
+        if progress_callback is not None:
+            progress_callback(key_length, key_length)
+        with stage("break.decrypt", codes.size):
+            return from_codes(decrypt_codes(codes, to_codes(discovered_key))), discovered_key
     
-    # Split the ciphertext into key_length groups
-    groups = [''] * key_length
-    for i, char in enumerate(ciphertext):
-        groups[i % key_length] += char
+    # Count the letters of each of the key_length groups
+    with stage("break.group", codes.size):
+        counts = residue_class_counts(codes, key_length)
     
     discovered_key = ""
     
-    # For each group, find the shift that gives frequencies closest to English
-    for group in groups:
-        best_shift = 0
-        best_score = float('inf')
-        
-        # Try each possible shift
-        for shift in range(26):
-            # Decrypt with this shift
-            decrypted = ''.join(chr(((ord(c) - ord('A') - shift) % 26) + ord('A')) for c in group)
-            
-            # Calculate frequency distribution
-            freqs = calculate_frequencies(decrypted)
-            
-            # Calculate chi-squared statistic (measure of how well frequencies match English)
-            chi_squared = sum(
-                ((freqs.get(letter, 0) - ENGLISH_FREQUENCIES[letter]) ** 2) / ENGLISH_FREQUENCIES[letter]
-                for letter in ENGLISH_FREQUENCIES
-            )
-            
-            # Update best shift if this is better
-            if chi_squared < best_score:
-                best_score = chi_squared
-                best_shift = shift
+    # Each group is a Caesar cipher: score all 26 shifts at once from its
+    # letter counts and keep the one closest to English
+    for group_index in range(key_length):
+        with stage("break.score", int(counts[group_index].sum())):
+            best_shift = int(score_shifts(counts[group_index]).argmin())
         
         # Add the best shift to the key (as a letter)
         discovered_key += chr(best_shift + ord('A'))
+        
+        if progress_callback is not None:
+            progress_callback(group_index + 1, key_length)
     
     # Decrypt the whole ciphertext with the discovered key
-    from vigenere_cipher import decrypt_vigenere
-    decrypted_text = decrypt_vigenere(ciphertext, discovered_key)
+    with stage("break.decrypt", codes.size):
+        decrypted_text = from_codes(decrypt_codes(codes, to_codes(discovered_key)))
     
     return decrypted_text, discovered_key
+
+@instrumented
+def crack_vigenere(ciphertext, max_length=20, min_confidence=0.99):
+    """
+    Break a Vigenère cipher without knowing the key length.
+    
+    Key lengths are tried from the most to the least likely according to
+    their IoC (the shortest of the near-best lengths first, since multiples
+    of the true length score as high). Each decryption is rated with
+    plausibility.score_plaintext, and the search stops at the first one
+    whose confidence reaches min_confidence.
+    
+    Args:
+        ciphertext (str): The ciphertext to break
+        max_length (int): The longest key length to try
+        min_confidence (float): Confidence at which to stop searching
+        
+    Returns:
+        tuple: (decrypted_text, discovered_key, confidence) of the most
+        plausible decryption found
+    """
+    from plausibility import score_plaintext
+    
+    scores = analyze_vigenere_key_length(ciphertext, max_length)
+    if not scores:
+        return "", "", 0.0
+    
+    near_best = near_best_lengths(scores)
+    others = sorted((length for length in scores if length not in near_best), key=lambda length: -scores[length])
+    
+    
+    best = None
+    for key_length in near_best + others:
+        decrypted_text, discovered_key = break_vigenere_cipher(ciphertext, key_length)
+        with stage("crack.score", len(decrypted_text)):
+            confidence = score_plaintext(decrypted_text)["confidence"]
+        if best is None or confidence > best[2]:
+            best = (decrypted_text, discovered_key, confidence)
+        if confidence >= min_confidence:
+            break
+    
+    return best
+
+@instrumented
+def break_polyalphabetic(ciphertext, key_length, variant="vigenere", key_mode="repeating"):
+    """
+    Recover the key of a Vigenère, Beaufort or variant Beaufort cipher.
+    
+    With a repeating key, each residue class is a single substitution: all 26
+    candidate key letters are scored at once from the class's letter counts.
+    With an autokey, the plaintext of each residue class only depends on the
+    key letter that starts it, so the 26 candidate starts of every class are
+    scored the same way. Candidates are ranked by chi-squared against English
+    letter frequencies, the first of equal scores winning.
+    
+    Args:
+        ciphertext (str): The ciphertext to break
+        key_length (int): The length of the key (or autokey primer)
+        variant (str): One of polyalphabetic.VARIANTS
+        key_mode (str): ``"repeating"`` or ``"autokey"``
+        
+    Returns:
+        tuple: (decrypted_text, discovered_key)
+    """
+    if variant not in VARIANTS:
+        raise ValueError(f"Unknown variant: {variant}")
+    if key_mode not in ("repeating", "autokey"):
+        raise ValueError(f"Cannot break key mode {key_mode!r} by frequency analysis")
+    
+    with stage("break.normalize", len(ciphertext)):
+        codes = to_codes(ciphertext).astype(np.int64)
+    
+    plain_sign, key_sign = VARIANTS[variant]
+    candidates = np.arange(26)
+    with stage("break.score", codes.size * 26):
+        if key_mode == "repeating":
+            # P = plain_sign * (C - key_sign * K): plaintext letter p under key k
+            # comes from ciphertext letter plain_sign * p + key_sign * k
+            counts = residue_class_counts(codes, key_length)
+            source = (plain_sign * candidates[None, :] + key_sign * candidates[:, None]) % 26
+            plain_counts = counts[:, source]
+        else:
+            # Decrypting with an all-A primer gives a base text; a primer letter
+            # k at the head of a class adds +k or -k (alternating with the
+            # variant) to every letter of that class
+            base = decrypt_codes(codes, np.zeros(key_length, dtype=np.int64), variant, "autokey")
+            plain_counts = np.zeros((key_length, 26, 26), dtype=np.int64)
+            for residue in range(key_length):
+                column = base[residue::key_length]
+                signs = (-plain_sign * key_sign) ** np.arange(1, column.size + 1)
+                letters = (column[None, :] + signs[None, :] * candidates[:, None]) % 26
+                plain_counts[residue] = np.bincount(
+                    (candidates[:, None] * 26 + letters).ravel(), minlength=26 * 26
+                ).reshape(26, 26)
+        
+        totals = np.maximum(plain_counts.sum(axis=2, keepdims=True), 1)
+        chi_squared = (((plain_counts / totals) - _EXPECTED) ** 2 / _EXPECTED).sum(axis=2)
+        key_codes = chi_squared.argmin(axis=1)
+    
+    with stage("break.decrypt", codes.size):
+        decrypted_text = from_codes(decrypt_codes(codes, key_codes, variant, key_mode))
+    
+    return decrypted_text, from_codes(key_codes)
+
+def residue_class_counts(codes, key_length, offset=0):
+    """
+    Count each letter in every residue class of the positions modulo key_length.
+    
+    Args:
+        codes (numpy.ndarray): Letter codes (0-25)
+        key_length (int): Number of residue classes
+        offset (int): Position of codes[0] in the whole text
+        
+    Returns:
+        numpy.ndarray: (key_length, 26) array of letter counts
+    """
+    counts = np.zeros((key_length, 26), dtype=np.int64)
+    
+    # Handle the elements before the first position that is a multiple of key_length
+    head = min((key_length - offset % key_length) % key_length, codes.size)
+    for i in range(head):
+        counts[(offset + i) % key_length, codes[i]] += 1
+    
+    # The aligned part is a 2D array with one column per residue class
+    body = codes[head:]
+    rows = body.size // key_length
+    aligned = body[:rows * key_length].reshape(rows, key_length)
+    for residue in range(key_length):
+        counts[residue] += np.bincount(aligned[:, residue], minlength=26)
+    
+    for i, code in enumerate(body[rows * key_length:].tolist()):
+        counts[i, code] += 1
+    
+    return counts
+
+def index_of_coincidence_from_counts(counts):
+    """
+    Average index of coincidence of the residue classes in a counts array.
+    
+    Args:
+        counts (numpy.ndarray): (key_length, 26) array from residue_class_counts
+        
+    Returns:
+        float: The mean IoC over the residue classes
+    """
+    n = counts.sum(axis=1)
+    pairs = (counts * (counts - 1)).sum(axis=1)
+    # Classes with fewer than two letters count as 0, as in calculate_index_of_coincidence
+    with np.errstate(divide='ignore', invalid='ignore'):
+        ic = np.where(n > 1, pairs / (n * (n - 1)), 0.0)
+    return float(ic.mean())
+
+def _residue_counts_worker(shm_name, size, start, stop, max_length):
+    shm = shared_memory.SharedMemory(name=shm_name)
+    codes = np.ndarray((size,), dtype=np.uint8, buffer=shm.buf)[start:stop]
+    try:
+        return [residue_class_counts(codes, key_length, start) for key_length in range(1, max_length + 1)]
+    finally:
+        # The view must be released before the mapping can be closed
+        del codes
+        shm.close()
+
+def _analyze_key_length_parallel(ciphertext, max_length, workers):
+    with stage("analyze.normalize", len(ciphertext)):
+        codes = to_codes(ciphertext)
+    
+    max_length = min(max_length, codes.size // 2)
+    if max_length < 1:
+        return {}
+    workers = workers or os.cpu_count()
+    
+    # Copy the codes into shared memory once; workers read their slice in place
+    shm = shared_memory.SharedMemory(create=True, size=codes.size)
+    try:
+        np.ndarray((codes.size,), dtype=np.uint8, buffer=shm.buf)[:] = codes
+        
+        bounds = np.linspace(0, codes.size, workers + 1, dtype=np.int64).tolist()
+        with stage("analyze.count", codes.size * max_length):
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                partials = list(pool.map(
+                    _residue_counts_worker,
+                    [shm.name] * workers,
+                    [codes.size] * workers,
+                    bounds[:-1],
+                    bounds[1:],
+                    [max_length] * workers,
+                ))
+    finally:
+        shm.close()
+        shm.unlink()
+    
+    # Reduce the per-slice counts and score every key length
+    results = {}
+    for key_length in range(1, max_length + 1):
+        counts = sum(partial[key_length - 1] for partial in partials)
+        results[key_length] = index_of_coincidence_from_counts(counts)
+    
+    return results
+
+def _as_codes(ciphertext):
+    # Letter codes are used as they are, so huge inputs need not be normalized again
+    if isinstance(ciphertext, np.ndarray):
+        return ciphertext
+    return to_codes(ciphertext)
+
+def _sample_residue_counts(codes, key_length, sample_size, rng):
+    """Letter counts of sample_size random positions (with replacement) of every residue class"""
+    residues = np.arange(key_length)
+    class_sizes = (codes.size - residues + key_length - 1) // key_length
+    rows = rng.integers(0, class_sizes[:, None], size=(key_length, sample_size))
+    letters = codes[residues[:, None] + key_length * rows].astype(np.intp)
+    flat = (residues[:, None] * 26 + letters).ravel()
+    return np.bincount(flat, minlength=key_length * 26).reshape(key_length, 26)
+
+class _StratifiedSample:
+    """Residue class letter counts that grow by sampling until they cover the whole class"""
+    
+    def __init__(self, codes, key_length, rng):
+        self.codes = codes
+        self.key_length = key_length
+        self.rng = rng
+        self.counts = np.zeros((key_length, 26), dtype=np.int64)
+        self.exact = False
+    
+    def grow(self, sample_size, target):
+        """Add sample_size positions per class; count exactly once target reaches the smallest class"""
+        if self.exact:
+            return
+        if target >= self.codes.size // self.key_length:
+            self.counts = residue_class_counts(self.codes, self.key_length)
+            self.exact = True
+        else:
+            self.counts += _sample_residue_counts(self.codes, self.key_length, sample_size, self.rng)
+
+def _ioc_estimate(counts):
+    """Mean IoC of the classes and its variance (U-statistic approximation per class)"""
+    n = counts.sum(axis=1).astype(float)
+    ioc = (counts * (counts - 1)).sum(axis=1) / (n * (n - 1))
+    p = counts / n[:, None]
+    s2 = (p ** 2).sum(axis=1)
+    s3 = (p ** 3).sum(axis=1)
+    variance = 4 * (n - 2) / (n * (n - 1)) * (s3 - s2 ** 2) + 2 / (n * (n - 1)) * (s2 - s2 ** 2)
+    return float(ioc.mean()), float(variance.sum() / counts.shape[0] ** 2)
+
+@instrumented
+def estimate_key_lengths(ciphertext, max_length=20, confidence=0.95, initial_sample=256,
+                         max_sample=65536, seed=0, verify=True, tolerance=0.9):
+    """
+    Estimate the IoC of every key length from stratified random samples.
+    
+    For each key length, the same number of random positions is drawn from
+    every residue class (positions modulo the key length). The leading length
+    is the first of near_best_lengths, the shortest one whose IoC is within
+    ``tolerance`` of the best. The sample is doubled until the
+    leader is statistically separated: that choice holds at both ends of the
+    intervals, and the leader's lower bound exceeds the upper bound of every
+    length that is not one of its multiples.
+    
+    Classes that are counted completely keep an interval, for the IoC of a
+    finite text is itself an estimate of the language's; short texts may
+    therefore end up not separated.
+    
+    Args:
+        ciphertext (str or numpy.ndarray): The ciphertext, or its letter codes
+            (from polyalphabetic.to_codes) to skip normalizing a huge input
+        max_length (int): Maximum key length to consider
+        confidence (float): Confidence level of the intervals
+        initial_sample (int): Positions sampled per residue class at first
+        max_sample (int): Stop growing the sample at this size per class
+        seed (int): Random seed
+        verify (bool): Compute the exact IoC of the leading length at the end
+        tolerance (float): How close to the best IoC the leading length must be
+        
+    Returns:
+        dict: ``ioc`` and ``intervals`` (by key length), the leading length
+        ``best``, whether it was ``separated``, the final ``sample_size`` per
+        class, the number of ``rounds``, and ``exact_ioc``/``verified``
+        (whether the choice holds with the exact IoC) when verify is set
+    """
+    with stage("estimate.normalize", len(ciphertext)):
+        codes = _as_codes(ciphertext)
+    
+    max_length = min(max_length, codes.size // 2)
+    result = {"ioc": {}, "intervals": {}, "best": None, "separated": False, "sample_size": 0,
+              "rounds": 0, "exact_ioc": None, "verified": None}
+    if max_length < 1:
+        return result
+    
+    z = NormalDist().inv_cdf((1 + confidence) / 2)
+    rng = np.random.default_rng(seed)
+    samples = {key_length: _StratifiedSample(codes, key_length, rng) for key_length in range(1, max_length + 1)}
+    
+    step = initial_sample
+    while True:
+        result["sample_size"] += step
+        result["rounds"] += 1
+        with stage("estimate.sample", step * max_length * (max_length + 1) // 2):
+            for sample in samples.values():
+                sample.grow(step, result["sample_size"])
+        
+        bounds = {}
+        for key_length, sample in samples.items():
+            ioc, variance = _ioc_estimate(sample.counts)
+            half_width = z * variance ** 0.5
+            result["ioc"][key_length] = ioc
+            bounds[key_length] = (ioc - half_width, ioc + half_width)
+        
+        top = max(result["ioc"], key=result["ioc"].get)
+        best = near_best_lengths(result["ioc"], tolerance)[0]
+        stable = bounds[best][0] >= tolerance * bounds[top][1] and all(
+            bounds[key_length][1] < tolerance * bounds[top][0] for key_length in range(1, best)
+        )
+        separated = stable and all(
+            bounds[best][0] > upper for key_length, (_, upper) in bounds.items() if key_length % best
+        )
+        
+        if separated or all(sample.exact for sample in samples.values()) or result["sample_size"] >= max_sample:
+            break
+        step = result["sample_size"]
+    
+    result["intervals"] = bounds
+    result["best"] = best
+    result["separated"] = separated
+    
+    if verify:
+        with stage("estimate.verify", codes.size):
+            exact_ioc = index_of_coincidence_from_counts(residue_class_counts(codes, best))
+        # The choice must still hold with the leader's exact IoC
+        result["exact_ioc"] = exact_ioc
+        result["verified"] = exact_ioc >= tolerance * result["ioc"][top] and all(
+            exact_ioc > upper for key_length, (_, upper) in bounds.items() if key_length % best
+        )
+    
+    return result
+
+@instrumented
+def estimate_vigenere_key(ciphertext, key_length, confidence=0.95, initial_sample=256,
+                          max_sample=65536, seed=0, verify=True, resamples=200):
+    """
+    Choose each key letter from random samples of its residue class.
+    
+    Each class is scored like in break_vigenere_cipher (chi-squared of the
+    decrypted letter frequencies against English, for all 26 shifts), with
+    bootstrap confidence intervals. The sample is doubled until, in every
+    class, the upper bound of the best shift is below the lower bound of the
+    second best.
+    
+    Args:
+        ciphertext (str or numpy.ndarray): The ciphertext, or its letter codes
+        key_length (int): The length of the key
+        confidence (float): Confidence level of the intervals
+        initial_sample (int): Positions sampled per residue class at first
+        max_sample (int): Stop growing the sample at this size per class
+        seed (int): Random seed
+        verify (bool): Also derive the key from the exact letter counts
+        resamples (int): Bootstrap resamples per round
+        
+    Returns:
+        dict: The sampled ``key``, per key letter its ``chi_squared``
+        estimate, confidence ``intervals`` and whether it was ``separated``,
+        the final ``sample_size`` per class, the number of ``rounds``, and
+        ``exact_key``/``verified`` when verify is set
+    """
+    with stage("estimate.normalize", len(ciphertext)):
+        codes = _as_codes(ciphertext)
+    
+    rng = np.random.default_rng(seed)
+    sample = _StratifiedSample(codes, key_length, rng)
+    alpha = (1 - confidence) / 2
+    classes = np.arange(key_length)
+    
+    result = {"sample_size": 0, "rounds": 0, "exact_key": None, "verified": None}
+    step = initial_sample
+    while True:
+        result["sample_size"] += step
+        result["rounds"] += 1
+        with stage("estimate.sample", step * key_length):
+            sample.grow(step, result["sample_size"])
+        
+        with stage("estimate.score", resamples * key_length * 26 * 26):
+            scores = score_shifts(sample.counts)
+            shifts = scores.argmin(axis=1)
+            runners_up = np.argsort(scores, axis=1, kind="stable")[:, 1]
+            if sample.exact:
+                lower = upper = scores
+            else:
+                n = sample.counts.sum(axis=1)
+                resampled = rng.multinomial(n, sample.counts / n[:, None], size=(resamples, key_length))
+                lower, upper = np.quantile(score_shifts(resampled), [alpha, 1 - alpha], axis=0)
+            separated = sample.exact | (upper[classes, shifts] < lower[classes, runners_up])
+        
+        if separated.all() or result["sample_size"] >= max_sample:
+            break
+        step = result["sample_size"]
+    
+    result["key"] = ''.join(chr(shift + ord('A')) for shift in shifts.tolist())
+    result["chi_squared"] = scores[classes, shifts].tolist()
+    result["intervals"] = list(zip(lower[classes, shifts].tolist(), upper[classes, shifts].tolist()))
+    result["separated"] = separated.tolist()
+    
+    if verify:
+        with stage("estimate.verify", codes.size):
+            exact_shifts = score_shifts(residue_class_counts(codes, key_length)).argmin(axis=1)
+        result["exact_key"] = ''.join(chr(shift + ord('A')) for shift in exact_shifts.tolist())
+        result["verified"] = result["exact_key"] == result["key"]
+    
+    return result
@@ -1,23 +1,17 @@
-import hashlib
+from hashing import hash_bytes
 
 def calculate_hashes(text):
     """Tính giá trị băm SHA-256, SHA-3 và MD5 cho văn bản đầu vào."""
     # Chuyển đổi văn bản thành bytes
     text_bytes = text.encode('utf-8')
     
-    # Tính SHA-256
-    sha256_hash = hashlib.sha256(text_bytes).hexdigest()
-    
-    # Tính SHA-3 (SHA3-256)
-    sha3_hash = hashlib.sha3_256(text_bytes).hexdigest()
-    
-    # Tính MD5
-    md5_hash = hashlib.md5(text_bytes).hexdigest()
+    # Tính SHA-256, SHA-3 (SHA3-256) và MD5
+    hashes = hash_bytes(text_bytes, ('sha256', 'sha3_256', 'md5'))
     
     return {
-        'SHA-256': sha256_hash,
-        'SHA-3': sha3_hash,
-        'MD5': md5_hash
+        'SHA-256': hashes['sha256'],
+        'SHA-3': hashes['sha3_256'],
+        'MD5': hashes['md5']
     }
 
 def compare_hashes(text1, text2):
@@ -45,12 +39,6 @@ def compare_hashes(text1, text2):
         print(f"Số bit khác nhau: {diff_bits}/{total_bits} ({diff_percentage:.2f}%)")
         print("-" * 70)
 
-# Thử nghiệm với hai văn bản chỉ khác nhau một ký tự
-text1 = "Đây là một văn bản mẫu để kiểm tra tính chất của hàm băm."
-text2 = "Đây là một văn bản mẫu để kiểm tra tính chất của hàm băm!"  # Thêm dấu chấm than
-
-compare_hashes(text1, text2)
-
 # Lưu kết quả ra file
 def save_hashes_to_file(filename, text):
     with open(filename, 'w', encoding='utf-8') as f:
@@ -58,7 +46,14 @@ def save_hashes_to_file(filename, text):
         for hash_type, hash_value in hashes.items():
             f.write(f"{hash_type}: {hash_value}\n")
 
-save_hashes_to_file("hash_results_original.txt", text1)
-save_hashes_to_file("hash_results_modified.txt", text2)
-
-print("\nĐã lưu kết quả vào files hash_results_original.txt và hash_results_modified.txt")
+if __name__ == "__main__":
+    # Thử nghiệm với hai văn bản chỉ khác nhau một ký tự
+    text1 = "Đây là một văn bản mẫu để kiểm tra tính chất của hàm băm."
+    text2 = "Đây là một văn bản mẫu để kiểm tra tính chất của hàm băm!"  # Thêm dấu chấm than
+    
+    compare_hashes(text1, text2)
+    
+    save_hashes_to_file("hash_results_original.txt", text1)
+    save_hashes_to_file("hash_results_modified.txt", text2)
+    
+    print("\nĐã lưu kết quả vào files hash_results_original.txt và hash_results_modified.txt")
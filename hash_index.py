@@ -0,0 +1,289 @@
+"""
+Persistent content-hash index stored in SQLite.
+
+Each file is recorded with its size, mtime (ns) and inode next to its SHA-256,
+SHA3-256 and MD5 digests. Updating the index only rehashes files whose
+(size, mtime_ns, inode) changed, so re-verifying a large tree after a few
+edits only reads the edited files.
+
+    python hash_index.py update DIR [...] --db hashes.sqlite
+    python hash_index.py query FILE [...] --db hashes.sqlite
+    python hash_index.py export --format csv --db hashes.sqlite > hashes.csv
+"""
+import argparse
+import csv
+import json
+import os
+import sqlite3
+import sys
+import time
+
+from hashing import DEFAULT_ALGORITHMS, hash_files
+
+DEFAULT_DB_PATH = "hashes.sqlite"
+
+COLUMNS = ("path", "size", "mtime_ns", "inode") + DEFAULT_ALGORITHMS + ("indexed_at",)
+
+# Rows written per transaction while updating
+WRITE_BATCH_SIZE = 1000
+
+# SQLite limits the number of bound parameters per statement
+QUERY_CHUNK_SIZE = 500
+
+SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    inode INTEGER NOT NULL,
+    {", ".join(f"{name} TEXT NOT NULL" for name in DEFAULT_ALGORITHMS)},
+    indexed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS files_sha256 ON files (sha256);
+CREATE INDEX IF NOT EXISTS files_md5 ON files (md5);
+"""
+
+def scan(root, failed=None):
+    """
+    Yield ``(path, stat_result)`` for every regular file below root.
+
+    Uses ``os.scandir`` so the stat information comes with the directory
+    listing where the platform provides it. Directories that cannot be
+    listed and files that cannot be stat'ed (other than because they no
+    longer exist) are skipped; their paths are appended to ``failed`` when
+    it is a list.
+    """
+    root = os.path.abspath(root)
+    if os.path.isfile(root):
+        yield root, os.stat(root)
+        return
+
+    stack = [root]
+    while stack:
+        directory = stack.pop()
+        try:
+            entries = sorted(os.scandir(directory), key=lambda entry: entry.name)
+        except FileNotFoundError:
+            # Deleted since it was listed: its entries are pruned like any removed file
+            continue
+        except OSError:
+            if failed is not None:
+                failed.append(directory)
+            continue
+        for entry in entries:
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.is_file(follow_symlinks=False):
+                    yield entry.path, entry.stat(follow_symlinks=False)
+            except FileNotFoundError:
+                continue
+            except OSError:
+                if failed is not None:
+                    failed.append(entry.path)
+
+class HashIndex:
+    """
+    On-disk index of file digests keyed by path, size, mtime and inode.
+
+    Args:
+        db_path (str): SQLite database file (created if missing)
+    """
+
+    def __init__(self, db_path=DEFAULT_DB_PATH):
+        self.db_path = db_path
+        self.conn = sqlite3.connect(db_path)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        self.conn.close()
+
+    def update(self, roots, workers=None, prune=True):
+        """
+        Bring the index up to date with the files below the given roots.
+
+        Args:
+            roots (iterable): Directories or files to index
+            workers (int): Number of hashing threads
+            prune (bool): Remove entries for files that no longer exist below the roots
+
+        Returns:
+            dict: Counts of scanned, unchanged, hashed, removed and failed files,
+            and the number of bytes hashed. Directories that could not be
+            listed count as failed, and their entries are never pruned.
+        """
+        roots = [os.path.abspath(root) for root in roots]
+        known = {
+            row["path"]: (row["size"], row["mtime_ns"], row["inode"])
+            for row in self.conn.execute("SELECT path, size, mtime_ns, inode FROM files")
+        }
+
+        stats = {"scanned": 0, "unchanged": 0, "hashed": 0, "removed": 0, "failed": 0, "bytes_hashed": 0}
+        seen = set()
+        unreadable = []
+        pending = {}
+        for root in roots:
+            for path, st in scan(root, unreadable):
+                stats["scanned"] += 1
+                seen.add(path)
+                signature = (st.st_size, st.st_mtime_ns, st.st_ino)
+                if known.get(path) == signature:
+                    stats["unchanged"] += 1
+                else:
+                    pending[path] = signature
+
+        batch = []
+        for path, digests in hash_files(pending, DEFAULT_ALGORITHMS, workers):
+            if isinstance(digests, OSError):
+                stats["failed"] += 1
+                continue
+            size, mtime_ns, inode = pending[path]
+            batch.append((path, size, mtime_ns, inode, *(digests[name] for name in DEFAULT_ALGORITHMS), time.time()))
+            stats["hashed"] += 1
+            stats["bytes_hashed"] += size
+            if len(batch) >= WRITE_BATCH_SIZE:
+                self._write(batch)
+                batch = []
+        self._write(batch)
+        stats["failed"] += len(unreadable)
+
+        if prune:
+            prefixes = tuple(root.rstrip(os.sep) + os.sep for root in roots)
+            # What could not be listed may still exist, so its entries are kept
+            unlisted = set(unreadable)
+            unlisted_prefixes = tuple(path.rstrip(os.sep) + os.sep for path in unreadable)
+            removed = [(path,) for path in known
+                       if path not in seen and (path in roots or path.startswith(prefixes))
+                       and path not in unlisted and not path.startswith(unlisted_prefixes)]
+            with self.conn:
+                self.conn.executemany("DELETE FROM files WHERE path = ?", removed)
+            stats["removed"] = len(removed)
+
+        return stats
+
+    def _write(self, rows):
+        if not rows:
+            return
+        placeholders = ", ".join("?" * len(COLUMNS))
+        with self.conn:
+            self.conn.executemany(
+                f"INSERT OR REPLACE INTO files ({', '.join(COLUMNS)}) VALUES ({placeholders})", rows
+            )
+
+    def lookup(self, paths):
+        """
+        Fetch the entries of many paths at once.
+
+        Returns:
+            dict: Absolute path -> entry dict, for the paths present in the index
+        """
+        paths = [os.path.abspath(path) for path in paths]
+        results = {}
+        for start in range(0, len(paths), QUERY_CHUNK_SIZE):
+            chunk = paths[start:start + QUERY_CHUNK_SIZE]
+            query = f"SELECT * FROM files WHERE path IN ({', '.join('?' * len(chunk))})"
+            for row in self.conn.execute(query, chunk):
+                results[row["path"]] = dict(row)
+        return results
+
+    def find(self, digest):
+        """
+        Find the indexed files with a given SHA-256 or MD5 digest.
+
+        Returns:
+            list: Entry dicts of the matching files
+        """
+        column = "md5" if len(digest) == 32 else "sha256"
+        rows = self.conn.execute(f"SELECT * FROM files WHERE {column} = ? ORDER BY path", (digest.lower(),))
+        return [dict(row) for row in rows]
+
+    def entries(self):
+        """Iterate over every entry in path order."""
+        for row in self.conn.execute("SELECT * FROM files ORDER BY path"):
+            yield dict(row)
+
+    def export(self, out, fmt="jsonl"):
+        """
+        Write the whole index to a text stream.
+
+        Args:
+            out: Writable text stream
+            fmt (str): ``"jsonl"``, ``"csv"`` or ``"sha256sum"`` (coreutils format)
+
+        Returns:
+            int: Number of entries written
+        """
+        count = 0
+        if fmt == "csv":
+            writer = csv.DictWriter(out, fieldnames=COLUMNS)
+            writer.writeheader()
+            for entry in self.entries():
+                writer.writerow(entry)
+                count += 1
+        elif fmt == "jsonl":
+            for entry in self.entries():
+                out.write(json.dumps(entry) + "\n")
+                count += 1
+        elif fmt == "sha256sum":
+            for entry in self.entries():
+                out.write(f"{entry['sha256']}  {entry['path']}\n")
+                count += 1
+        else:
+            raise ValueError(f"Unknown export format: {fmt}")
+        return count
+
+def main():
+    parser = argparse.ArgumentParser(description="Maintain a persistent index of file hashes.")
+    parser.add_argument("--db", default=DEFAULT_DB_PATH, help="SQLite database file")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    update = commands.add_parser("update", help="Index new and modified files")
+    update.add_argument("roots", nargs="+")
+    update.add_argument("--workers", type=int, default=None)
+    update.add_argument("--keep-missing", action="store_true", help="Keep entries of deleted files")
+
+    query = commands.add_parser("query", help="Print the indexed hashes of files")
+    query.add_argument("paths", nargs="+")
+
+    find = commands.add_parser("find", help="List files with a given SHA-256 or MD5 digest")
+    find.add_argument("digest")
+
+    export = commands.add_parser("export", help="Dump the index")
+    export.add_argument("--format", choices=("jsonl", "csv", "sha256sum"), default="jsonl")
+
+    args = parser.parse_args()
+
+    with HashIndex(args.db) as index:
+        if args.command == "update":
+            start = time.perf_counter()
+            stats = index.update(args.roots, args.workers, prune=not args.keep_missing)
+            stats["seconds"] = round(time.perf_counter() - start, 3)
+            print(json.dumps(stats))
+        elif args.command == "query":
+            entries = index.lookup(args.paths)
+            missing = False
+            for path in args.paths:
+                entry = entries.get(os.path.abspath(path))
+                if entry is None:
+                    print(f"{path}: not indexed", file=sys.stderr)
+                    missing = True
+                else:
+                    print(json.dumps(entry))
+            sys.exit(1 if missing else 0)
+        elif args.command == "find":
+            for entry in index.find(args.digest):
+                print(entry["path"])
+        elif args.command == "export":
+            index.export(sys.stdout, args.format)
+
+if __name__ == "__main__":
+    main()
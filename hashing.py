@@ -0,0 +1,221 @@
+"""
+Hash files and streams with several algorithms in a single read pass.
+
+    from hashing import hash_file
+    hash_file("data.bin")   # {'sha256': '...', 'sha3_256': '...', 'md5': '...'}
+
+Command line (directories are hashed recursively, files in parallel):
+
+    python hashing.py FILE_OR_DIR [...] [--algorithms sha256,md5] [--workers 8] [--json]
+"""
+import argparse
+import hashlib
+import json
+import mmap
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+DEFAULT_ALGORITHMS = ("sha256", "sha3_256", "md5")
+
+# Size of the reusable read buffer
+DEFAULT_BUFFER_SIZE = 1024 * 1024
+
+# Files at least this large are hashed through mmap instead of read calls
+MMAP_THRESHOLD = 64 * 1024 * 1024
+
+def _new_hashers(algorithms):
+    hashers = {}
+    for name in algorithms:
+        try:
+            hashers[name] = hashlib.new(name)
+        except ValueError:
+            raise ValueError(f"Unsupported hash algorithm: {name}") from None
+        if not hashers[name].digest_size:
+            raise ValueError(f"{name} has no fixed digest size (extendable-output functions are not supported)")
+    return hashers
+
+def check_algorithms(algorithms):
+    """Raise ValueError unless every name is a hashlib algorithm with a fixed digest size."""
+    _new_hashers(algorithms)
+
+def _check_buffer_size(buffer_size):
+    # A zero-length buffer would read nothing and hash every file as empty
+    if buffer_size < 1:
+        raise ValueError(f"Buffer size must be at least 1 byte, got {buffer_size}")
+
+def _hexdigests(hashers):
+    return {name: hasher.hexdigest() for name, hasher in hashers.items()}
+
+def hash_bytes(data, algorithms=DEFAULT_ALGORITHMS):
+    """
+    Hash an in-memory buffer.
+
+    Args:
+        data (bytes): The data to hash
+        algorithms (iterable): hashlib algorithm names
+
+    Returns:
+        dict: Algorithm name -> hex digest
+    """
+    hashers = _new_hashers(algorithms)
+    for hasher in hashers.values():
+        hasher.update(data)
+    return _hexdigests(hashers)
+
+def hash_stream(stream, algorithms=DEFAULT_ALGORITHMS, buffer_size=DEFAULT_BUFFER_SIZE):
+    """
+    Hash a binary stream, reading it only once for all algorithms.
+
+    Data is read with ``readinto`` into one reused buffer, so no new bytes
+    objects are allocated per chunk.
+
+    Args:
+        stream: A binary file object supporting ``readinto``
+        algorithms (iterable): hashlib algorithm names
+        buffer_size (int): Size of the read buffer in bytes
+
+    Returns:
+        dict: Algorithm name -> hex digest
+    """
+    _check_buffer_size(buffer_size)
+    hashers = list(_new_hashers(algorithms).items())
+    buffer = bytearray(buffer_size)
+    view = memoryview(buffer)
+
+    while True:
+        size = stream.readinto(buffer)
+        if not size:
+            break
+        chunk = view[:size]
+        for _, hasher in hashers:
+            hasher.update(chunk)
+
+    return _hexdigests(dict(hashers))
+
+def _hash_mapped(f, size, algorithms, buffer_size):
+    hashers = _new_hashers(algorithms)
+    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        view = memoryview(mapped)
+        try:
+            for offset in range(0, size, buffer_size):
+                chunk = view[offset:offset + buffer_size]
+                for hasher in hashers.values():
+                    hasher.update(chunk)
+                chunk.release()
+        finally:
+            view.release()
+    return _hexdigests(hashers)
+
+def hash_file(path, algorithms=DEFAULT_ALGORITHMS, buffer_size=DEFAULT_BUFFER_SIZE,
+              mmap_threshold=MMAP_THRESHOLD):
+    """
+    Hash a file with every algorithm in one pass over its contents.
+
+    Args:
+        path (str): Path of the file
+        algorithms (iterable): hashlib algorithm names
+        buffer_size (int): Read buffer (or mmap chunk) size in bytes
+        mmap_threshold (int): Files at least this large are memory-mapped;
+            ``None`` disables mmap
+
+    Returns:
+        dict: Algorithm name -> hex digest
+    """
+    _check_buffer_size(buffer_size)
+    with open(path, "rb", buffering=0) as f:
+        size = os.fstat(f.fileno()).st_size
+        if mmap_threshold is not None and size >= max(mmap_threshold, 1):
+            try:
+                return _hash_mapped(f, size, algorithms, buffer_size)
+            except (OSError, ValueError):
+                # Not mappable (e.g. special files), fall back to reading
+                f.seek(0)
+        return hash_stream(f, algorithms, buffer_size)
+
+def iter_files(root):
+    """
+    Yield the regular files below root, sorted.
+
+    A root that is not a directory is yielded as it is, so that a missing
+    path is reported by hash_file instead of silently skipped.
+    """
+    if not os.path.isdir(root):
+        yield root
+        return
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames.sort()
+        for filename in sorted(filenames):
+            path = os.path.join(dirpath, filename)
+            if os.path.isfile(path) and not os.path.islink(path):
+                yield path
+
+def hash_files(paths, algorithms=DEFAULT_ALGORITHMS, workers=None, buffer_size=DEFAULT_BUFFER_SIZE):
+    """
+    Hash many files in parallel threads (hashlib releases the GIL on large updates).
+
+    Args:
+        paths (iterable): Paths of the files to hash
+        algorithms (iterable): hashlib algorithm names
+        workers (int): Number of threads (defaults to ThreadPoolExecutor's choice)
+        buffer_size (int): Read buffer size per file
+
+    Yields:
+        tuple: ``(path, digests)`` in input order; ``digests`` is an
+        ``OSError`` if the file could not be read
+    """
+    algorithms = tuple(algorithms)
+    # Fail early on unknown algorithms or an unusable buffer size
+    check_algorithms(algorithms)
+    _check_buffer_size(buffer_size)
+
+    def hash_one(path):
+        try:
+            return path, hash_file(path, algorithms, buffer_size)
+        except OSError as e:
+            return path, e
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        yield from pool.map(hash_one, paths)
+
+def hash_tree(root, algorithms=DEFAULT_ALGORITHMS, workers=None):
+    """
+    Hash every file below a directory.
+
+    Returns:
+        dict: Path -> digests (or the ``OSError`` raised reading it)
+    """
+    return dict(hash_files(iter_files(root), algorithms, workers))
+
+def main():
+    parser = argparse.ArgumentParser(description="Hash files and directory trees with several algorithms at once.")
+    parser.add_argument("paths", nargs="+", help="Files or directories to hash")
+    parser.add_argument("--algorithms", default=",".join(DEFAULT_ALGORITHMS),
+                        help="Comma-separated hashlib algorithm names")
+    parser.add_argument("--workers", type=int, default=None, help="Number of hashing threads")
+    parser.add_argument("--buffer-size", type=int, default=DEFAULT_BUFFER_SIZE)
+    parser.add_argument("--json", action="store_true", help="Print one JSON object per file")
+    args = parser.parse_args()
+
+    algorithms = [name.strip() for name in args.algorithms.split(",")]
+    try:
+        check_algorithms(algorithms)
+        _check_buffer_size(args.buffer_size)
+    except ValueError as e:
+        parser.error(str(e))
+    paths = (path for root in args.paths for path in iter_files(root))
+
+    failed = False
+    for path, digests in hash_files(paths, algorithms, args.workers, args.buffer_size):
+        if isinstance(digests, OSError):
+            print(f"{path}: {digests.strerror}", file=sys.stderr)
+            failed = True
+        elif args.json:
+            print(json.dumps({"path": path, **digests}))
+        else:
+            print("  ".join(digests[name] for name in algorithms) + f"  {path}")
+
+    sys.exit(1 if failed else 0)
+
+if __name__ == "__main__":
+    main()
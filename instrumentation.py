@@ -0,0 +1,210 @@
+"""
+Opt-in instrumentation for the cipher and analysis pipeline.
+
+Stages of the hot paths are wrapped in ``stage()`` blocks and public functions
+in ``@instrumented``. While nothing is collecting (the default) these return
+immediately, so the cost is a global and a context variable lookup per call.
+
+    import instrumentation
+
+    with instrumentation.collect() as stats:
+        break_vigenere_cipher(ciphertext, 5)
+    print(instrumentation.to_json(stats))
+
+``collect()`` only sees the work of its own context (thread or asyncio
+task), so concurrent collectors, e.g. one per Streamlit session, do not see
+or reset each other's numbers. ``enable()`` turns on process-wide statistics,
+read with ``snapshot()``, that include every thread.
+"""
+import functools
+import io
+import json
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+_enabled = False
+_stats = {}
+_lock = threading.Lock()
+
+# Statistics dicts of the collect() blocks active in the current context
+_collectors = ContextVar("instrumentation_collectors", default=())
+
+class _NullStage:
+    """Shared no-op context manager returned while instrumentation is off."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def add_bytes(self, nbytes):
+        pass
+
+_NULL_STAGE = _NullStage()
+
+class _Stage:
+    def __init__(self, name, nbytes):
+        self.name = name
+        self.nbytes = nbytes
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        _record(self.name, time.perf_counter() - self.start, self.nbytes)
+        return False
+
+    def add_bytes(self, nbytes):
+        """Count bytes that are only known once the stage is running."""
+        self.nbytes += nbytes
+
+def _add(stats, name, seconds, nbytes, calls):
+    entry = stats.get(name)
+    if entry is None:
+        entry = stats[name] = {"calls": 0, "seconds": 0.0, "bytes": 0}
+    entry["calls"] += calls
+    entry["seconds"] += seconds
+    entry["bytes"] += nbytes
+
+def _record(name, seconds, nbytes=0, calls=1):
+    if _enabled:
+        with _lock:
+            _add(_stats, name, seconds, nbytes, calls)
+    # Only this context writes to its collectors, so they need no lock
+    for stats in _collectors.get():
+        _add(stats, name, seconds, nbytes, calls)
+
+def _active():
+    return _enabled or bool(_collectors.get())
+
+def is_enabled():
+    """Whether anything is collecting statistics in the current context."""
+    return _active()
+
+def enable():
+    """Collect process-wide statistics, from every thread, until disable()."""
+    global _enabled
+    _enabled = True
+
+def disable():
+    global _enabled
+    _enabled = False
+
+def reset():
+    with _lock:
+        _stats.clear()
+
+def stage(name, nbytes=0):
+    """
+    Time a block of code as the named stage.
+
+    Args:
+        name (str): Stage name, e.g. ``"analyze.count"``
+        nbytes (int): Number of bytes the stage processes
+
+    Returns:
+        A context manager; its ``add_bytes`` method adds to the byte count
+    """
+    if not _active():
+        return _NULL_STAGE
+    return _Stage(name, nbytes)
+
+def count(name, calls=1, nbytes=0):
+    """Increment the counters of a stage without timing it."""
+    if _active():
+        _record(name, 0.0, nbytes, calls)
+
+def instrumented(func):
+    """Decorator counting the calls and total time of a function."""
+    name = func.__qualname__
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if not _active():
+            return func(*args, **kwargs)
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            _record(name, time.perf_counter() - start)
+
+    return wrapper
+
+def snapshot():
+    """
+    Copy the process-wide statistics collected since enable().
+
+    Returns:
+        dict: Stage name -> ``{"calls", "seconds", "bytes"}``
+    """
+    with _lock:
+        return {name: dict(entry) for name, entry in _stats.items()}
+
+def to_json(stats=None):
+    """Serialize statistics (by default the current ones) to JSON."""
+    return json.dumps(snapshot() if stats is None else stats, indent=2, sort_keys=True)
+
+@contextmanager
+def collect():
+    """
+    Collect the statistics of the block in the current context.
+
+    Work done in other threads is not included, and collectors may be nested
+    or run concurrently in other threads without affecting each other.
+
+    Yields:
+        dict: Stage name -> ``{"calls", "seconds", "bytes"}``, filled while
+        the block runs
+    """
+    stats = {}
+    token = _collectors.set(_collectors.get() + (stats,))
+    try:
+        yield stats
+    finally:
+        _collectors.reset(token)
+
+@contextmanager
+def profile(backend="cprofile", limit=30):
+    """
+    Run the block under a profiler.
+
+    Args:
+        backend (str): ``"cprofile"`` or ``"pyinstrument"`` (optional dependency)
+        limit (int): Number of functions listed in the cProfile report
+
+    Yields:
+        dict: Its ``"report"`` key holds the text report when the block exits
+    """
+    result = {}
+    if backend == "cprofile":
+        import cProfile
+        import pstats
+
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            yield result
+        finally:
+            profiler.disable()
+            buffer = io.StringIO()
+            pstats.Stats(profiler, stream=buffer).sort_stats("cumulative").print_stats(limit)
+            result["report"] = buffer.getvalue()
+    elif backend == "pyinstrument":
+        try:
+            from pyinstrument import Profiler
+        except ImportError:
+            raise ImportError("The pyinstrument backend requires 'pip install pyinstrument'")
+
+        profiler = Profiler()
+        profiler.start()
+        try:
+            yield result
+        finally:
+            profiler.stop()
+            result["report"] = profiler.output_text()
+    else:
+        raise ValueError(f"Unknown profiler backend: {backend}")
@@ -0,0 +1,94 @@
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+# Job states
+PENDING = "pending"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+CANCELLED = "cancelled"
+
+class JobCancelled(Exception):
+    """Raised inside a running job when the user has asked to cancel it."""
+
+class Job:
+    """
+    A single background analysis with its progress, result and cancel flag.
+
+    The job function receives ``progress_callback`` as a keyword argument and
+    should call it as ``progress_callback(done, total)``. Cancellation is
+    cooperative: the next progress report after ``cancel()`` raises
+    ``JobCancelled`` inside the worker.
+    """
+
+    def __init__(self, label):
+        self.id = uuid.uuid4().hex
+        self.label = label
+        self.status = PENDING
+        self.progress = 0.0
+        self.result = None
+        self.error = None
+        self._cancel_event = threading.Event()
+        self._future = None
+
+    @property
+    def finished(self):
+        """bool: Whether the job has stopped running, for whatever reason."""
+        return self.status in (DONE, FAILED, CANCELLED)
+
+    def report_progress(self, done, total):
+        """Record progress from the solver and honour pending cancellations."""
+        if self._cancel_event.is_set():
+            raise JobCancelled()
+        if total:
+            self.progress = min(done / total, 1.0)
+
+    def cancel(self):
+        """Ask the job to stop; jobs that have not started yet never run."""
+        self._cancel_event.set()
+        if self._future is not None and self._future.cancel():
+            self.status = CANCELLED
+
+    def _run(self, func, args, kwargs):
+        if self._cancel_event.is_set():
+            self.status = CANCELLED
+            return
+
+        self.status = RUNNING
+        try:
+            self.result = func(*args, progress_callback=self.report_progress, **kwargs)
+        except JobCancelled:
+            self.status = CANCELLED
+        except Exception as e:
+            self.error = e
+            self.status = FAILED
+        else:
+            self.progress = 1.0
+            self.status = DONE
+
+class JobRunner:
+    """
+    A worker pool shared by every session of the process.
+
+    Args:
+        max_workers (int): Number of analyses allowed to run at the same time
+    """
+
+    def __init__(self, max_workers=2):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="analysis-job")
+
+    def submit(self, func, *args, label="", **kwargs):
+        """
+        Start ``func(*args, progress_callback=..., **kwargs)`` in the background.
+
+        Returns:
+            Job: The handle used to poll progress, fetch the result or cancel
+        """
+        job = Job(label)
+        job._future = self._executor.submit(job._run, func, args, kwargs)
+        return job
+
+    def shutdown(self):
+        """Cancel queued jobs and stop the worker threads."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,168 @@
+"""
+Score how much candidate decryptions look like English.
+
+All candidates are converted to one uint8 array of letter codes and scored
+together in a single pass: index of coincidence, chi-squared against English
+letter frequencies, and the log-likelihood of their letters and bigrams under
+an English model relative to uniformly random letters. All four and the
+number of letters are combined by a logistic model into a confidence
+between 0 and 1:
+
+    from plausibility import score_candidates
+    scores = score_candidates(["THEENEMYWILLATTACKATDAWNFROMTHENORTH", "QXZVKRPLMWJTBNOEYHAFGUCSIDQWLZPMXRTV"])
+    scores["confidence"]   # array([0.99..., 0.02...])
+"""
+import os
+from functools import lru_cache
+
+import numpy as np
+
+from frequency_analysis import ENGLISH_FREQUENCIES
+from polyalphabetic import to_codes
+
+BIGRAM_CORPUS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "corpora", "english.txt")
+
+# Logistic model weights for (bigram LLR, unigram LLR, letters, chi-squared,
+# letters x IoC, bias), fitted with calibrate() on 20-200 000 letter windows
+# of the docstrings of textwrap, json, argparse, collections, functools,
+# pathlib, shutil, subprocess, threading, logging, heapq, bisect, string,
+# random and statistics (English held out from the bigram corpus) against the
+# same texts decrypted with random keys, solved with a wrong key length,
+# shuffled, or replaced by random letters. The LLRs are sums, so the letters
+# term sets how much evidence each letter must add: text whose letters are
+# merely English-like (shuffled, or a wrong-length solution) falls further
+# below it the longer it is. The negative unigram LLR and IoC weights come
+# from the wrong-length solutions: the solver fits their letter frequencies
+# to English more closely than real English text, their bigrams it does not.
+CALIBRATION = (0.601, -0.8046, 0.0082, -0.0185, -0.7853, 0.5835)
+
+_ENGLISH_PROBABILITIES = np.array(list(ENGLISH_FREQUENCIES.values())) / sum(ENGLISH_FREQUENCIES.values())
+_UNIGRAM_LOG_RATIO = np.log(_ENGLISH_PROBABILITIES * 26)
+
+@lru_cache(maxsize=1)
+def bigram_log_ratios():
+    """
+    Log-probability of each bigram in English minus that of a random bigram.
+
+    Estimated from the bundled corpus with add-one smoothing.
+
+    Returns:
+        numpy.ndarray: 676 values indexed by ``first * 26 + second``
+    """
+    with open(BIGRAM_CORPUS, encoding="utf-8") as f:
+        codes = to_codes(f.read()).astype(np.intp)
+    counts = np.bincount(codes[:-1] * 26 + codes[1:], minlength=676) + 1.0
+    return np.log(counts / counts.sum() * 676)
+
+def candidates_to_codes(candidates):
+    """
+    Concatenate candidate texts into one array of letter codes.
+
+    Args:
+        candidates (list): Strings, bytes or arrays of letter codes (0-25)
+
+    Returns:
+        tuple: ``(codes, lengths)`` with the concatenated codes and the
+        number of letters of each candidate
+    """
+    parts = [
+        np.asarray(candidate, dtype=np.uint8) if isinstance(candidate, np.ndarray) else to_codes(candidate)
+        for candidate in candidates
+    ]
+    lengths = np.array([part.size for part in parts], dtype=np.intp)
+    codes = np.concatenate(parts) if parts else np.zeros(0, dtype=np.uint8)
+    return codes, lengths
+
+def _features(codes, lengths):
+    n_candidates = lengths.size
+    owner = np.repeat(np.arange(n_candidates), lengths)
+    codes = codes.astype(np.intp)
+
+    # Letter counts of every candidate at once: one (n_candidates, 26) histogram
+    counts = np.bincount(owner * 26 + codes, minlength=n_candidates * 26).reshape(n_candidates, 26)
+
+    # Bigrams that do not cross the boundary between two candidates
+    same_owner = owner[1:] == owner[:-1]
+    bigrams = codes[:-1][same_owner] * 26 + codes[1:][same_owner]
+    bigram_llr = np.bincount(owner[1:][same_owner], weights=bigram_log_ratios()[bigrams], minlength=n_candidates)
+    unigram_llr = counts @ _UNIGRAM_LOG_RATIO
+
+    n = lengths.astype(float)
+    expected = n[:, None] * _ENGLISH_PROBABILITIES[None, :]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        ioc = np.where(n > 1, (counts * (counts - 1)).sum(axis=1) / (n * (n - 1)), 0.0)
+        chi_squared = np.where(n > 0, ((counts - expected) ** 2 / expected).sum(axis=1), 0.0)
+
+    return bigram_llr, unigram_llr, ioc, chi_squared
+
+def _design(bigram_llr, unigram_llr, ioc, chi_squared, lengths):
+    n = lengths.astype(float)
+    return np.column_stack([bigram_llr, unigram_llr, n, chi_squared, n * ioc, np.ones_like(n)])
+
+def _confidence(features, lengths, calibration=CALIBRATION):
+    logit = _design(*features, lengths) @ np.asarray(calibration)
+    confidence = 1.0 / (1.0 + np.exp(-np.clip(logit, -500, 500)))
+    # Without a single letter there is no evidence of English at all
+    return np.where(lengths > 0, confidence, 0.0)
+
+def score_candidates(candidates, calibration=CALIBRATION):
+    """
+    Score a batch of candidate plaintexts.
+
+    Args:
+        candidates (list): Strings, bytes or arrays of letter codes (0-25)
+        calibration (tuple): Logistic weights, see CALIBRATION
+
+    Returns:
+        dict: NumPy arrays with one value per candidate: ``ioc``,
+        ``chi_squared``, ``bigram_log_likelihood`` (mean log-ratio per
+        bigram), ``letters`` and ``confidence``
+    """
+    codes, lengths = candidates_to_codes(candidates)
+    features = _features(codes, lengths)
+    bigram_llr, _, ioc, chi_squared = features
+
+    n = lengths.astype(float)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        mean_bigram = np.where(n > 1, bigram_llr / (n - 1), 0.0)
+
+    return {
+        "ioc": ioc,
+        "chi_squared": chi_squared,
+        "bigram_log_likelihood": mean_bigram,
+        "letters": lengths,
+        "confidence": _confidence(features, lengths, calibration),
+    }
+
+def score_plaintext(text, calibration=CALIBRATION):
+    """
+    Score a single candidate plaintext.
+
+    Returns:
+        dict: The same keys as score_candidates, as plain numbers
+    """
+    scores = score_candidates([text], calibration)
+    return {name: values[0].item() for name, values in scores.items()}
+
+def calibrate(english, not_english, iterations=50):
+    """
+    Fit the logistic weights on labelled examples (Newton's method).
+
+    Args:
+        english (list): Texts that are English
+        not_english (list): Texts that are not
+
+    Returns:
+        tuple: Weights usable as the ``calibration`` argument
+    """
+    codes, lengths = candidates_to_codes(list(english) + list(not_english))
+    x = _design(*_features(codes, lengths), lengths)
+    y = np.concatenate([np.ones(len(english)), np.zeros(len(not_english))])
+    weights = np.zeros(x.shape[1])
+    for _ in range(iterations):
+        p = 1.0 / (1.0 + np.exp(-np.clip(x @ weights, -500, 500)))
+        gradient = x.T @ (p - y)
+        # A small ridge term keeps the problem well-posed when the classes separate
+        hessian = (x * (p * (1 - p))[:, None]).T @ x + 1e-3 * np.eye(x.shape[1])
+        weights -= np.linalg.solve(hessian, gradient + 1e-3 * weights)
+    return tuple(round(float(w), 4) for w in weights)
@@ -0,0 +1,173 @@
+"""
+Vectorized engine for polyalphabetic substitution ciphers.
+
+A cipher is a tabula recta variant combined with a key stream:
+
+- variants: ``"vigenere"`` (C = P + K), ``"beaufort"`` (C = K - P) and
+  ``"variant_beaufort"`` (C = P - K), all modulo 26;
+- key streams: ``"repeating"`` (the key over and over), ``"autokey"`` (the
+  key, then the plaintext itself) and ``"running"`` (a long text, e.g. a book
+  loaded with load_running_key, used once).
+
+Every combination works on whole NumPy arrays of letter codes, so they all
+run at the speed of plain Vigenère:
+
+    from polyalphabetic import encrypt, decrypt
+    ciphertext = encrypt("ATTACKATDAWN", "QUEEN", variant="beaufort", key_mode="autokey")
+    decrypt(ciphertext, "QUEEN", variant="beaufort", key_mode="autokey")   # 'ATTACKATDAWN'
+"""
+import numpy as np
+
+# Encryption is C = plain_sign * P + key_sign * K (mod 26)
+VARIANTS = {
+    "vigenere": (1, 1),
+    "beaufort": (-1, 1),
+    "variant_beaufort": (1, -1),
+}
+
+KEY_MODES = ("repeating", "autokey", "running")
+
+def to_codes(text):
+    """
+    Normalize text like encrypt_vigenere does and convert it to letter codes.
+
+    Letters are uppercased and everything else is dropped. Non-ASCII letters
+    are kept and reduced modulo 26, as caesar_shift does; bytes are read as
+    ASCII. The ciphers and the analyses all normalize with this function, so
+    they see the same letters.
+
+    Args:
+        text (str or bytes): The text to convert
+
+    Returns:
+        numpy.ndarray: uint8 array of letter codes (0-25)
+    """
+    if isinstance(text, str):
+        if not text.isascii():
+            letters = ''.join(c.upper() for c in text if c.isalpha())
+            codes = np.fromiter(map(ord, letters), dtype=np.int64, count=len(letters))
+            return ((codes - ord('A')) % 26).astype(np.uint8)
+        text = text.encode('ascii')
+    # Fold lowercase onto uppercase, then keep only A-Z
+    codes = np.frombuffer(text, dtype=np.uint8) & 0xDF
+    return codes[(codes >= ord('A')) & (codes <= ord('Z'))] - ord('A')
+
+def from_codes(codes):
+    """Convert letter codes (0-25) back to an uppercase string."""
+    return (np.asarray(codes, dtype=np.uint8) + ord('A')).tobytes().decode('ascii')
+
+def load_running_key(path):
+    """
+    Read a running key from a text file.
+
+    Returns:
+        str: The letters of the file, uppercased
+    """
+    with open(path, encoding="utf-8") as f:
+        return from_codes(to_codes(f.read()))
+
+def _check(variant, key_mode, key_codes):
+    if variant not in VARIANTS:
+        raise ValueError(f"Unknown variant: {variant}")
+    if key_mode not in KEY_MODES:
+        raise ValueError(f"Unknown key mode: {key_mode}")
+    if not key_codes.size:
+        raise ValueError("Key must contain at least one alphabetic character")
+    return VARIANTS[variant]
+
+def key_stream(key_codes, length, key_mode="repeating", plaintext_codes=None):
+    """
+    Build the key stream for a text of the given length.
+
+    Args:
+        key_codes (numpy.ndarray): Letter codes of the key
+        length (int): Number of letters to cover
+        key_mode (str): One of KEY_MODES
+        plaintext_codes (numpy.ndarray): The plaintext, required for autokey
+
+    Returns:
+        numpy.ndarray: ``length`` letter codes
+    """
+    if key_mode == "repeating":
+        return np.resize(key_codes, length)
+    if key_mode == "autokey":
+        return np.concatenate([key_codes, plaintext_codes])[:length]
+    if key_codes.size < length:
+        raise ValueError(f"Running key is shorter than the text ({key_codes.size} < {length} letters)")
+    return key_codes[:length]
+
+def encrypt_codes(codes, key_codes, variant="vigenere", key_mode="repeating"):
+    """
+    Encrypt an array of letter codes.
+
+    Returns:
+        numpy.ndarray: The ciphertext letter codes
+    """
+    plain_sign, key_sign = _check(variant, key_mode, key_codes)
+    codes, key_codes = codes.astype(np.int64), key_codes.astype(np.int64)
+    stream = key_stream(key_codes, codes.size, key_mode, codes)
+    return (plain_sign * codes + key_sign * stream) % 26
+
+def _autokey_decrypt(codes, key_codes, cipher_sign, key_sign):
+    # Written as rows of len(key) letters, each plaintext row is the key of
+    # the next one: P[j] = cipher_sign * C[j] + key_sign * P[j-1] with P[-1]
+    # the key. Unrolled, that is a (signed) cumulative sum over the rows.
+    width = key_codes.size
+    rows = -(-codes.size // width)
+    padded = np.zeros(rows * width, dtype=np.int64)
+    padded[:codes.size] = codes
+    padded = padded.reshape(rows, width)
+
+    if key_sign == 1:
+        plain = np.cumsum(cipher_sign * padded, axis=0) + key_codes
+    else:
+        signs = np.where(np.arange(rows) % 2, -1, 1)[:, None]
+        plain = signs * np.cumsum(signs * cipher_sign * padded, axis=0) - signs * key_codes
+    return plain.ravel()[:codes.size] % 26
+
+def decrypt_codes(codes, key_codes, variant="vigenere", key_mode="repeating"):
+    """
+    Decrypt an array of letter codes.
+
+    Returns:
+        numpy.ndarray: The plaintext letter codes
+    """
+    plain_sign, key_sign = _check(variant, key_mode, key_codes)
+    codes, key_codes = codes.astype(np.int64), key_codes.astype(np.int64)
+    # Solving C = plain_sign * P + key_sign * K for P (the signs are their own inverses)
+    cipher_sign, key_sign = plain_sign, -plain_sign * key_sign
+
+    if key_mode == "autokey":
+        return _autokey_decrypt(codes, key_codes, cipher_sign, key_sign)
+    stream = key_stream(key_codes, codes.size, key_mode)
+    return (cipher_sign * codes + key_sign * stream) % 26
+
+def encrypt(plaintext, key, variant="vigenere", key_mode="repeating"):
+    """
+    Encrypt text with a polyalphabetic cipher.
+
+    Args:
+        plaintext (str): The text to encrypt
+        key (str): The key (the running text for ``key_mode="running"``)
+        variant (str): One of VARIANTS
+        key_mode (str): One of KEY_MODES
+
+    Returns:
+        str: The ciphertext, uppercase letters only
+    """
+    return from_codes(encrypt_codes(to_codes(plaintext), to_codes(key), variant, key_mode))
+
+def decrypt(ciphertext, key, variant="vigenere", key_mode="repeating"):
+    """
+    Decrypt text encrypted with a polyalphabetic cipher.
+
+    Args:
+        ciphertext (str): The text to decrypt
+        key (str): The key (the running text for ``key_mode="running"``)
+        variant (str): One of VARIANTS
+        key_mode (str): One of KEY_MODES
+
+    Returns:
+        str: The plaintext, uppercase letters only
+    """
+    return from_codes(decrypt_codes(to_codes(ciphertext), to_codes(key), variant, key_mode))
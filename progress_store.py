@@ -0,0 +1,252 @@
+"""
+Persistent learner progress stored in SQLite.
+
+The app records a learner's progress on every level change or completed
+challenge. ``save`` only puts the state on a queue; a single writer thread
+owns the database connection, keeps the latest state of each learner and
+writes all of them in one transaction once a batch is full or the flush
+interval has passed. Reads use a separate connection (WAL mode lets them run
+while the writer commits) and see states that are still queued.
+
+    python progress_store.py stats --db progress.sqlite
+    python progress_store.py show LEARNER_ID --db progress.sqlite
+"""
+import argparse
+import json
+import queue
+import sqlite3
+import sys
+import threading
+import time
+
+DEFAULT_DB_PATH = "progress.sqlite"
+
+# Progress fields persisted for every learner, with their session defaults
+FIELDS = {
+    "game_level": 1,
+    "challenges_completed": 0,
+    "level1_correct": False,
+    "level2_correct": False,
+    "level3_correct": False,
+    "final_challenge_completed": False,
+    "mission_completed": False,
+}
+
+_BOOLEAN_FIELDS = {name for name, default in FIELDS.items() if isinstance(default, bool)}
+
+SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS progress (
+    learner_id TEXT PRIMARY KEY,
+    {", ".join(f"{name} INTEGER NOT NULL" for name in FIELDS)},
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS progress_level ON progress (game_level);
+"""
+
+_UPSERT = (
+    f"INSERT INTO progress (learner_id, {', '.join(FIELDS)}, updated_at) "
+    f"VALUES ({', '.join('?' * (len(FIELDS) + 2))}) "
+    f"ON CONFLICT (learner_id) DO UPDATE SET "
+    f"{', '.join(f'{name} = excluded.{name}' for name in FIELDS)}, updated_at = excluded.updated_at"
+)
+
+def _connect(db_path, check_same_thread=True):
+    conn = sqlite3.connect(db_path, check_same_thread=check_same_thread)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    return conn
+
+class ProgressStore:
+    """
+    Learner progress with write-behind batching.
+
+    Args:
+        db_path (str): SQLite database file (created if missing)
+        flush_interval (float): Longest time, in seconds, a state waits
+            before being written
+        batch_size (int): Write as soon as this many learners are pending
+    """
+
+    def __init__(self, db_path=DEFAULT_DB_PATH, flush_interval=1.0, batch_size=500):
+        self.db_path = db_path
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.last_error = None
+        self.metrics = {"saved": 0, "written": 0, "batches": 0}
+
+        with _connect(db_path) as conn:
+            conn.executescript(SCHEMA)
+        conn.close()
+
+        # Shared by the reading threads (one per session in Streamlit)
+        self._reader = _connect(db_path, check_same_thread=False)
+        self._read_lock = threading.Lock()
+
+        # States saved but not yet committed, so that loads never go back in time
+        self._unflushed = {}
+        self._unflushed_lock = threading.Lock()
+
+        self._queue = queue.Queue()
+        self._writer = threading.Thread(target=self._run, name="progress-writer", daemon=True)
+        self._writer.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def save(self, learner_id, state):
+        """
+        Queue the progress of a learner (returns immediately).
+
+        Args:
+            learner_id (str): The learner
+            state (dict): Values of FIELDS; missing fields keep their defaults
+        """
+        row = {name: state.get(name, default) for name, default in FIELDS.items()}
+        with self._unflushed_lock:
+            self._unflushed[learner_id] = row
+            self.metrics["saved"] += 1
+        self._queue.put((learner_id, row))
+
+    def load(self, learner_id):
+        """
+        Fetch the progress of a learner.
+
+        Returns:
+            dict: Values of FIELDS, or None for an unknown learner
+        """
+        with self._unflushed_lock:
+            row = self._unflushed.get(learner_id)
+        if row is not None:
+            return dict(row)
+
+        with self._read_lock:
+            found = self._reader.execute(
+                f"SELECT {', '.join(FIELDS)} FROM progress WHERE learner_id = ?", (learner_id,)
+            ).fetchone()
+        if found is None:
+            return None
+        return {name: bool(found[name]) if name in _BOOLEAN_FIELDS else found[name] for name in FIELDS}
+
+    def stats(self):
+        """
+        Aggregate progress of all learners (committed states only).
+
+        Returns:
+            dict: Number of learners, how many are at each level, average
+            completed challenges and how many finished the final challenge
+            and the mission
+        """
+        with self._read_lock:
+            totals = self._reader.execute(
+                "SELECT COUNT(*) AS learners, AVG(challenges_completed) AS average_challenges, "
+                "SUM(final_challenge_completed) AS final_completed, SUM(mission_completed) AS missions_completed "
+                "FROM progress"
+            ).fetchone()
+            levels = self._reader.execute(
+                "SELECT game_level, COUNT(*) AS learners FROM progress GROUP BY game_level ORDER BY game_level"
+            ).fetchall()
+        return {
+            "learners": totals["learners"],
+            "by_level": {row["game_level"]: row["learners"] for row in levels},
+            "average_challenges": totals["average_challenges"] or 0.0,
+            "final_completed": totals["final_completed"] or 0,
+            "missions_completed": totals["missions_completed"] or 0,
+        }
+
+    def flush(self, timeout=None):
+        """Wait until every state saved so far is written."""
+        done = threading.Event()
+        self._queue.put(done)
+        return done.wait(timeout)
+
+    def close(self):
+        """Write the pending states and stop the writer thread."""
+        if self._writer.is_alive():
+            self._queue.put(None)
+            self._writer.join()
+        self._reader.close()
+
+    def _run(self):
+        conn = _connect(self.db_path)
+        pending = {}
+        deadline = None
+        stopping = False
+        while not stopping:
+            timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                item = False
+
+            waiters = []
+            if item is None:
+                stopping = True
+            elif isinstance(item, threading.Event):
+                waiters.append(item)
+            elif item is not False:
+                learner_id, row = item
+                # Only the latest state of each learner is written
+                pending[learner_id] = row
+                if deadline is None:
+                    deadline = time.monotonic() + self.flush_interval
+
+            due = deadline is not None and time.monotonic() >= deadline
+            if pending and (stopping or waiters or due or len(pending) >= self.batch_size):
+                if self._write(conn, pending):
+                    pending = {}
+                    deadline = None
+                else:
+                    # Retry with the next batch (e.g. while the database is locked)
+                    deadline = time.monotonic() + self.flush_interval
+            for waiter in waiters:
+                waiter.set()
+        conn.close()
+
+    def _write(self, conn, pending):
+        now = time.time()
+        rows = [(learner_id, *(int(row[name]) for name in FIELDS), now) for learner_id, row in pending.items()]
+        try:
+            with conn:
+                conn.executemany(_UPSERT, rows)
+        except sqlite3.Error as e:
+            self.last_error = str(e)
+            return False
+
+        with self._unflushed_lock:
+            for learner_id, row in pending.items():
+                # A newer state may have been saved while this batch was written
+                if self._unflushed.get(learner_id) is row:
+                    del self._unflushed[learner_id]
+        self.metrics["written"] += len(rows)
+        self.metrics["batches"] += 1
+        return True
+
+def main():
+    parser = argparse.ArgumentParser(description="Inspect the stored learner progress.")
+    parser.add_argument("--db", default=DEFAULT_DB_PATH, help="SQLite database file")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("stats", help="Print aggregate progress")
+    show = commands.add_parser("show", help="Print the progress of learners")
+    show.add_argument("learners", nargs="+")
+    args = parser.parse_args()
+
+    with ProgressStore(args.db) as store:
+        if args.command == "stats":
+            print(json.dumps(store.stats(), indent=2))
+        else:
+            missing = False
+            for learner_id in args.learners:
+                state = store.load(learner_id)
+                if state is None:
+                    print(f"{learner_id}: unknown learner", file=sys.stderr)
+                    missing = True
+                else:
+                    print(json.dumps({"learner_id": learner_id, **state}))
+            sys.exit(1 if missing else 0)
+
+if __name__ == "__main__":
+    main()
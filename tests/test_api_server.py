@@ -0,0 +1,21 @@
+from api_server import MAX_KEY_LENGTH, execute_batch
+
+
+def test_batch_reports_errors_per_item():
+    results = execute_batch([
+        {"op": "encrypt", "text": "ATTACKATDAWN", "key": "LEMON"},
+        {"op": []},
+        {"op": {"encrypt": 1}},
+        {"op": "rot13"},
+        {"op": "decrypt", "text": "LXFOPVEFRNHR"},
+        {"op": "analyze", "ciphertext": "LXFOPVEFRNHR", "max_length": MAX_KEY_LENGTH + 1},
+    ])
+
+    assert results == [
+        {"result": "LXFOPVEFRNHR"},
+        {"error": "Unknown operation: []"},
+        {"error": "Unknown operation: {'encrypt': 1}"},
+        {"error": "Unknown operation: rot13"},
+        {"error": "Missing parameter: key"},
+        {"error": f"max_length must be between 1 and {MAX_KEY_LENGTH}"},
+    ]
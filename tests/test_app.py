@@ -0,0 +1,57 @@
+import pytest
+import streamlit as st
+from streamlit.testing.v1 import AppTest
+
+from vigenere_cipher import encrypt_vigenere
+
+
+@pytest.fixture
+def app(tmp_path, monkeypatch):
+    monkeypatch.setenv("VIGENERE_PROGRESS_DB", str(tmp_path / "progress.sqlite"))
+    # The progress store is a cached resource; start every test with a fresh one
+    st.cache_resource.clear()
+    st.cache_data.clear()
+    at = AppTest.from_file("../app.py", default_timeout=60)
+    at.run()
+    yield at
+    st.cache_resource.clear()
+
+
+def test_final_challenge_counts_toward_the_mission(app):
+    app.text_input(key="level1_answer").input(encrypt_vigenere("VIETNAM", "KEY")).run()
+    app.button(key="level1_next").click().run()
+    # level_up() runs after the page was drawn; the next rerun shows level 2
+    app.run()
+
+    app.text_input(key="level2_key").input("HANOI")
+    app.text_input(key="level2_answer").input("CHUCMUNGBANDALAMNENLEVEL")
+    app.button(key="check_level2").click().run()
+    assert app.session_state.challenges_completed == 2
+    assert not app.session_state.mission_completed
+
+    # Level 3 skipped: the final challenge is the third solved one
+    app.session_state.game_level = 4
+    app.run()
+    app.text_input(key="final_key").input("CIPHER")
+    app.text_area(key="final_message").input("Hướng dẫn về bảo mật thông tin")
+    app.button(key="complete_final").click().run()
+    assert app.session_state.final_challenge_completed
+    assert app.session_state.challenges_completed == 3
+    assert app.session_state.mission_completed
+
+    # Submitting the final answer again changes nothing
+    app.button(key="complete_final").click().run()
+    assert app.session_state.challenges_completed == 3
+
+
+def test_level_3_quiz_survives_its_own_reruns(app):
+    app.session_state.game_level = 3
+    app.run()
+    app.button(key="break_cipher_btn").click().run()
+    app.radio(key="level3_message_type").set_value("Hướng dẫn về bảo mật thông tin").run()
+    app.button(key="submit_level3").click().run()
+    assert app.session_state.level3_correct
+
+    app.button(key="level3_next").click().run()
+    app.run()
+    assert app.session_state.game_level == 4
@@ -0,0 +1,24 @@
+import corpus_generator
+from corpus_generator import evaluate, generate_dataset, guess_key_length
+
+
+def test_guess_key_length_prefers_the_shortest_near_best_length():
+    record = generate_dataset(1, [400], [6], seed=3)[0]
+    assert guess_key_length(record["ciphertext"]) == 6
+
+
+def test_solver_errors_are_counted_apart_from_misses(monkeypatch):
+    def crashing(record, max_length=20):
+        if record["seed"] % 2:
+            raise IndexError("boom")
+        return record["key"]
+
+    monkeypatch.setitem(corpus_generator.SOLVERS, "crashing", crashing)
+    records = generate_dataset(4, [100], [5], seed=1)
+    (row,) = evaluate(records, ["crashing"])
+
+    crashed = sum(record["seed"] % 2 for record in records)
+    assert row["samples"] == 4
+    assert row["errors"] == crashed
+    assert row["error"] == ("IndexError: boom" if crashed else None)
+    assert row["crack_rate"] == (4 - crashed) / 4
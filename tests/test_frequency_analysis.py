@@ -0,0 +1,32 @@
+import numpy as np
+import pytest
+
+from frequency_analysis import ENGLISH_FREQUENCIES, break_vigenere_cipher
+from polyalphabetic import to_codes
+from vigenere_cipher import encrypt_vigenere
+
+KEY = "QUIXOTICALLY"
+
+
+@pytest.fixture(scope="module")
+def ciphertext():
+    # Random letters with English frequencies: enough for chi-squared to find every key letter
+    rng = np.random.default_rng(0)
+    weights = np.array(list(ENGLISH_FREQUENCIES.values()))
+    codes = rng.choice(26, size=200_000, p=weights / weights.sum()).astype(np.uint8)
+    plaintext = (codes + ord("A")).tobytes().decode("ascii")
+    return plaintext, encrypt_vigenere(plaintext, KEY)
+
+
+@pytest.mark.parametrize("verify", [True, False])
+def test_break_approximate_accepts_letter_codes(ciphertext, verify):
+    plaintext, cipher = ciphertext
+    decrypted, key = break_vigenere_cipher(to_codes(cipher), 12, approximate=True, verify=verify)
+    assert key == KEY
+    assert decrypted == plaintext
+    assert (decrypted, key) == break_vigenere_cipher(cipher, 12, approximate=True, verify=verify)
+
+
+def test_break_accepts_letter_codes(ciphertext):
+    _, cipher = ciphertext
+    assert break_vigenere_cipher(np.asarray(to_codes(cipher)), 12) == break_vigenere_cipher(cipher, 12)
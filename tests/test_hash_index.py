@@ -0,0 +1,65 @@
+import os
+
+import pytest
+
+import hash_index
+from hash_index import HashIndex
+
+
+@pytest.fixture
+def tree(tmp_path):
+    for name in ("a/one.txt", "a/two.txt", "b/three.txt", "top.txt"):
+        path = tmp_path / "tree" / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(name)
+    return tmp_path / "tree"
+
+
+@pytest.fixture
+def index(tmp_path):
+    with HashIndex(str(tmp_path / "hashes.sqlite")) as index:
+        yield index
+
+
+def test_update_rehashes_only_changed_files(tree, index):
+    assert index.update([str(tree)])["hashed"] == 4
+
+    (tree / "a" / "one.txt").write_text("changed, and longer")
+    stats = index.update([str(tree)])
+    assert (stats["hashed"], stats["unchanged"], stats["removed"]) == (1, 3, 0)
+
+
+def test_deleted_files_are_pruned(tree, index):
+    index.update([str(tree)])
+    (tree / "b" / "three.txt").unlink()
+    (tree / "b").rmdir()
+
+    assert index.update([str(tree)])["removed"] == 1
+    assert len(list(index.entries())) == 3
+
+
+def test_unreadable_directory_is_failed_not_pruned(tree, index, monkeypatch):
+    index.update([str(tree)])
+    unreadable = str(tree / "a")
+    scandir = os.scandir
+
+    def failing_scandir(path):
+        if path == unreadable:
+            raise PermissionError(13, "Permission denied", path)
+        return scandir(path)
+
+    monkeypatch.setattr(hash_index.os, "scandir", failing_scandir)
+    stats = index.update([str(tree)])
+
+    assert stats["failed"] == 1
+    assert stats["removed"] == 0
+    assert len(list(index.entries())) == 4
+
+
+def test_missing_root_prunes_its_entries(tree, index):
+    index.update([str(tree / "b")])
+    (tree / "b" / "three.txt").unlink()
+    (tree / "b").rmdir()
+
+    stats = index.update([str(tree / "b")])
+    assert (stats["failed"], stats["removed"]) == (0, 1)
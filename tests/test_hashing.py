@@ -0,0 +1,62 @@
+import hashlib
+import sys
+
+import pytest
+
+import hashing
+from hashing import check_algorithms, hash_bytes, hash_file, hash_tree
+
+
+@pytest.fixture
+def data_file(tmp_path):
+    path = tmp_path / "data.bin"
+    path.write_bytes(bytes(range(256)) * 41)
+    return path
+
+
+def expected(path):
+    data = path.read_bytes()
+    return {name: hashlib.new(name, data).hexdigest() for name in hashing.DEFAULT_ALGORITHMS}
+
+
+@pytest.mark.parametrize("buffer_size", [1, 7, 4096, hashing.DEFAULT_BUFFER_SIZE])
+@pytest.mark.parametrize("mmap_threshold", [None, 1])
+def test_hash_file_matches_hashlib(data_file, buffer_size, mmap_threshold):
+    assert hash_file(data_file, buffer_size=buffer_size, mmap_threshold=mmap_threshold) == expected(data_file)
+
+
+def test_hash_bytes_matches_hashlib(data_file):
+    assert hash_bytes(data_file.read_bytes()) == expected(data_file)
+
+
+@pytest.mark.parametrize("buffer_size", [0, -1])
+def test_rejects_empty_buffer(data_file, buffer_size):
+    with pytest.raises(ValueError):
+        hash_file(data_file, buffer_size=buffer_size)
+
+
+@pytest.mark.parametrize("name", ["shake_128", "not_a_hash"])
+def test_rejects_algorithms_without_fixed_digest(name):
+    with pytest.raises(ValueError, match=name):
+        check_algorithms(["sha256", name])
+
+
+def test_missing_root_is_reported(tmp_path):
+    missing = str(tmp_path / "missing")
+    assert isinstance(hash_tree(missing)[missing], FileNotFoundError)
+
+
+@pytest.mark.parametrize("arguments", [["--buffer-size", "0"], ["--algorithms", "shake_128"]])
+def test_cli_rejects_invalid_options(monkeypatch, data_file, arguments):
+    monkeypatch.setattr(sys, "argv", ["hashing.py", str(data_file), *arguments])
+    with pytest.raises(SystemExit) as exit_info:
+        hashing.main()
+    assert exit_info.value.code == 2
+
+
+def test_cli_fails_on_missing_root(monkeypatch, tmp_path, capsys):
+    monkeypatch.setattr(sys, "argv", ["hashing.py", str(tmp_path / "missing")])
+    with pytest.raises(SystemExit) as exit_info:
+        hashing.main()
+    assert exit_info.value.code == 1
+    assert "missing" in capsys.readouterr().err
@@ -0,0 +1,44 @@
+import threading
+
+import instrumentation
+from frequency_analysis import break_vigenere_cipher
+
+
+def test_collectors_in_other_threads_are_isolated():
+    busy_started = threading.Event()
+    idle_may_exit = threading.Event()
+    results = {}
+
+    def idle():
+        with instrumentation.collect() as stats:
+            busy_started.wait()
+            idle_may_exit.wait()
+        results["idle"] = stats
+
+    def busy():
+        with instrumentation.collect() as stats:
+            busy_started.set()
+            break_vigenere_cipher("LXFOPVEFRNHR" * 20, 5)
+            idle_may_exit.set()
+            # The other collector exiting must not turn this one off
+            thread.join()
+            break_vigenere_cipher("LXFOPVEFRNHR" * 20, 5)
+        results["busy"] = stats
+
+    thread = threading.Thread(target=idle)
+    thread.start()
+    busy()
+
+    assert results["idle"] == {}
+    assert results["busy"]["break_vigenere_cipher"]["calls"] == 2
+
+
+def test_nested_collectors_both_record():
+    with instrumentation.collect() as outer:
+        with instrumentation.stage("outer.only"):
+            pass
+        with instrumentation.collect() as inner:
+            instrumentation.count("both", nbytes=10)
+    assert set(outer) == {"outer.only", "both"}
+    assert inner == {"both": {"calls": 1, "seconds": 0.0, "bytes": 10}}
+    assert not instrumentation.is_enabled()
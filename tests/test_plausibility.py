@@ -0,0 +1,70 @@
+import codecs
+import contextlib
+import importlib
+import inspect
+import io
+import re
+
+import numpy as np
+import pytest
+
+from corpus_generator import MarkovModel, load_corpus
+from plausibility import score_candidates
+from vigenere_cipher import decrypt_vigenere
+
+
+@pytest.fixture(scope="module")
+def english():
+    return MarkovModel(load_corpus(), 3).generate(20_000, np.random.default_rng(0))
+
+
+@pytest.mark.parametrize("length", [50, 400, 20_000, 200_000])
+def test_confidence_does_not_grow_with_length_for_shuffled_english(english, length):
+    rng = np.random.default_rng(length)
+    text = (english * (length // len(english) + 1))[:length]
+    letters = np.frombuffer(text.encode("ascii"), dtype=np.uint8).copy()
+    rng.shuffle(letters)
+    random = (rng.integers(0, 26, size=length, dtype=np.uint8) + ord("A")).tobytes().decode("ascii")
+
+    confidence = score_candidates([text, letters.tobytes().decode("ascii"), random])["confidence"]
+    assert confidence[0] > 0.9
+    assert confidence[1] < 0.1
+    assert confidence[2] < 0.1
+
+
+# Modules whose docstrings were used neither for the bigram table nor for CALIBRATION
+HELD_OUT_MODULES = ("fractions", "decimal", "csv", "tempfile", "zipfile", "calendar", "difflib", "urllib.parse")
+
+
+@pytest.fixture(scope="module")
+def held_out_english():
+    with contextlib.redirect_stdout(io.StringIO()):
+        import this
+    texts = [codecs.decode(this.s, "rot13")]
+    for name in HELD_OUT_MODULES:
+        module = importlib.import_module(name)
+        texts += [inspect.getdoc(obj) or "" for obj in [module, *vars(module).values()]
+                  if getattr(obj, "__module__", name) == name and (inspect.isclass(obj) or inspect.isfunction(obj))]
+    return "".join(re.findall("[A-Z]", "".join(texts).upper()))
+
+
+@pytest.mark.parametrize("length, confident", [(50, 0.8), (100, 0.95), (200, 0.98)])
+def test_held_out_english_is_recognized(held_out_english, length, confident):
+    windows = [held_out_english[start:start + length] for start in range(0, len(held_out_english) - length, length)]
+    rng = np.random.default_rng(length)
+    # Keys without an A, which would leave a whole residue class in English
+    keys = [(rng.integers(1, 26, size=5, dtype=np.uint8) + ord("A")).tobytes().decode("ascii") for _ in windows]
+    wrong_key = [decrypt_vigenere(window, key) for window, key in zip(windows, keys)]
+
+    confidence = score_candidates(windows + wrong_key)["confidence"]
+    english, decrypted = confidence[:len(windows)], confidence[len(windows):]
+    assert len(windows) >= 100
+    assert np.mean(english >= 0.99) >= confident
+    assert np.mean(english >= 0.5) >= 0.95
+    # crack_vigenere stops at 0.99: a wrong key must never get there
+    assert decrypted.max() < 0.99
+    assert np.mean(decrypted >= 0.5) < 0.01
+
+
+def test_empty_text_has_no_confidence():
+    assert score_candidates(["", "123 !?"])["confidence"].tolist() == [0.0, 0.0]
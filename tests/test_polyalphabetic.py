@@ -0,0 +1,53 @@
+import numpy as np
+import pytest
+
+from frequency_analysis import break_polyalphabetic, break_vigenere_cipher
+from polyalphabetic import KEY_MODES, VARIANTS, decrypt, decrypt_codes, encrypt, to_codes
+
+
+def _sequential_autokey_decrypt(codes, key_codes, variant):
+    # Letter-by-letter definition: the key stream is the key, then the plaintext
+    plain_sign, key_sign = VARIANTS[variant]
+    stream = list(key_codes)
+    plain = []
+    for i, code in enumerate(codes):
+        letter = plain_sign * (code - key_sign * stream[i]) % 26
+        plain.append(letter)
+        stream.append(letter)
+    return np.array(plain, dtype=np.int64)
+
+
+def test_to_codes_keeps_non_ascii_letters():
+    assert to_codes("ab, C!").tolist() == [0, 1, 2]
+    assert to_codes(b"ab, C!").tolist() == [0, 1, 2]
+    assert to_codes("Đa").tolist() == [(ord("Đ") - ord("A")) % 26, 0]
+
+
+def test_autokey_known_vector():
+    assert encrypt("ATTACKATDAWN", "QUEENLY", key_mode="autokey") == "QNXEPVYTWTWP"
+    assert decrypt("QNXEPVYTWTWP", "QUEENLY", key_mode="autokey") == "ATTACKATDAWN"
+
+
+@pytest.mark.parametrize("variant", VARIANTS)
+@pytest.mark.parametrize("key_length", [1, 2, 3, 7, 40])
+@pytest.mark.parametrize("size", [0, 1, 5, 39, 40, 41, 250])
+def test_autokey_decrypt_matches_sequential_definition(variant, key_length, size):
+    rng = np.random.default_rng(size * 100 + key_length)
+    codes = rng.integers(0, 26, size=size)
+    key_codes = rng.integers(0, 26, size=key_length)
+    expected = _sequential_autokey_decrypt(codes, key_codes, variant)
+    assert decrypt_codes(codes, key_codes, variant, "autokey").tolist() == expected.tolist()
+
+
+@pytest.mark.parametrize("variant", VARIANTS)
+@pytest.mark.parametrize("key_mode", KEY_MODES)
+def test_round_trip(variant, key_mode):
+    rng = np.random.default_rng(1)
+    plaintext = (rng.integers(0, 26, size=500, dtype=np.uint8) + ord("A")).tobytes().decode("ascii")
+    key = "LEMON" if key_mode != "running" else plaintext[::-1] + "X"
+    assert decrypt(encrypt(plaintext, key, variant, key_mode), key, variant, key_mode) == plaintext
+
+
+def test_break_polyalphabetic_normalizes_like_break_vigenere_cipher():
+    ciphertext = "ĐLXFOPVEFRNHR" * 5
+    assert break_polyalphabetic(ciphertext, 5) == break_vigenere_cipher(ciphertext, 5)
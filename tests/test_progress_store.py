@@ -0,0 +1,95 @@
+import sqlite3
+
+import pytest
+
+import progress_store
+from progress_store import FIELDS, ProgressStore
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return str(tmp_path / "progress.sqlite")
+
+
+def committed(db_path, learner_id):
+    with sqlite3.connect(db_path) as conn:
+        return conn.execute("SELECT game_level FROM progress WHERE learner_id = ?", (learner_id,)).fetchone()
+
+
+def test_load_sees_queued_states_before_they_are_written(db_path):
+    # A long flush interval keeps the state queued until flush() is called
+    with ProgressStore(db_path, flush_interval=60) as store:
+        assert store.load("a") is None
+        store.save("a", {"game_level": 3, "level1_correct": True})
+
+        assert store.load("a") == {**FIELDS, "game_level": 3, "level1_correct": True}
+        assert committed(db_path, "a") is None
+
+        assert store.flush(timeout=5)
+        assert committed(db_path, "a") == (3,)
+        assert store.load("a") == {**FIELDS, "game_level": 3, "level1_correct": True}
+
+
+def test_only_the_latest_state_of_a_learner_is_written(db_path):
+    with ProgressStore(db_path, flush_interval=60) as store:
+        for level in (1, 2, 3, 4):
+            store.save("a", {"game_level": level})
+        store.save("b", {"game_level": 2})
+        store.flush(timeout=5)
+
+        assert store.metrics == {"saved": 5, "written": 2, "batches": 1}
+        assert store.load("a")["game_level"] == 4
+
+
+def test_full_batch_is_written_without_waiting_for_the_interval(db_path):
+    with ProgressStore(db_path, flush_interval=60, batch_size=2) as store:
+        store.save("a", {})
+        store.save("b", {})
+        # flush() only waits here; the batch was already due
+        store.flush(timeout=5)
+        assert store.metrics["batches"] == 1
+
+
+def test_stats_counts_committed_learners(db_path):
+    with ProgressStore(db_path, flush_interval=60) as store:
+        store.save("a", {"game_level": 4, "challenges_completed": 3,
+                         "final_challenge_completed": True, "mission_completed": True})
+        store.save("b", {"game_level": 2, "challenges_completed": 1})
+        store.save("c", {"game_level": 2})
+        store.flush(timeout=5)
+
+        assert store.stats() == {
+            "learners": 3,
+            "by_level": {2: 2, 4: 1},
+            "average_challenges": pytest.approx(4 / 3),
+            "final_completed": 1,
+            "missions_completed": 1,
+        }
+
+
+def test_close_writes_pending_states(db_path):
+    store = ProgressStore(db_path, flush_interval=60)
+    store.save("a", {"game_level": 2})
+    store.close()
+
+    assert committed(db_path, "a") == (2,)
+    with ProgressStore(db_path) as reopened:
+        assert reopened.load("a")["game_level"] == 2
+
+
+def test_failed_write_is_retried(db_path, monkeypatch):
+    with ProgressStore(db_path, flush_interval=60) as store:
+        monkeypatch.setattr(progress_store, "_UPSERT", "INSERT INTO missing_table VALUES (?)")
+        store.save("a", {"game_level": 2})
+        store.flush(timeout=5)
+
+        assert store.last_error is not None
+        assert store.metrics["written"] == 0
+        assert committed(db_path, "a") is None
+        # The state stays visible while it waits for the retry
+        assert store.load("a")["game_level"] == 2
+
+        monkeypatch.undo()
+        store.flush(timeout=5)
+        assert committed(db_path, "a") == (2,)
+        assert store.metrics["written"] == 1
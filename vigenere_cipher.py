@@ -1,3 +1,6 @@
+from instrumentation import instrumented, stage
+from polyalphabetic import to_codes, from_codes, encrypt_codes, decrypt_codes
+
 def caesar_shift(char, shift):
     """
     Shifts a single character by the specified amount (Caesar cipher).
@@ -21,6 +24,7 @@ def caesar_shift(char, shift):
     # Convert back to character
     return chr(shifted_code + ord('A'))
 
+@instrumented
 def encrypt_vigenere(plaintext, key):
     """
     Encrypt plaintext using the Vigenère cipher with the given key.
@@ -33,26 +37,18 @@ def encrypt_vigenere(plaintext, key):
         str: The encrypted ciphertext
     """
     # Normalize inputs - convert to uppercase and remove non-alphabetic characters
-    plaintext = ''.join(c.upper() for c in plaintext if c.isalpha())
-    key = ''.join(c.upper() for c in key if c.isalpha())
+    with stage("encrypt.normalize", len(plaintext)):
+        plaintext_codes = to_codes(plaintext)
+        key_codes = to_codes(key)
     
-    if not key:
+    if not key_codes.size:
         raise ValueError("Key must contain at least one alphabetic character")
     
-    result = ""
-    
-    for i in range(len(plaintext)):
-        # Get the current key character (cycling through the key)
-        key_char = key[i % len(key)]
-        
-        # Convert key character to shift value (A=0, B=1, ..., Z=25)
-        shift = ord(key_char) - ord('A')
-        
-        # Shift the plaintext character and add to result
-        result += caesar_shift(plaintext[i], shift)
-    
-    return result
+    # Shift every letter by the key letter at its position, all at once
+    with stage("encrypt.shift", plaintext_codes.size):
+        return from_codes(encrypt_codes(plaintext_codes, key_codes))
 
+@instrumented
 def decrypt_vigenere(ciphertext, key):
     """
     Decrypt ciphertext using the Vigenère cipher with the given key.
@@ -65,23 +61,13 @@ def decrypt_vigenere(ciphertext, key):
         str: The decrypted plaintext
     """
     # Normalize inputs - convert to uppercase and remove non-alphabetic characters
-    ciphertext = ''.join(c.upper() for c in ciphertext if c.isalpha())
-    key = ''.join(c.upper() for c in key if c.isalpha())
+    with stage("decrypt.normalize", len(ciphertext)):
+        ciphertext_codes = to_codes(ciphertext)
+        key_codes = to_codes(key)
     
-    if not key:
+    if not key_codes.size:
         raise ValueError("Key must contain at least one alphabetic character")
     
-    result = ""
-    
-    for i in range(len(ciphertext)):
-        # Get the current key character (cycling through the key)
-        key_char = key[i % len(key)]
-        
-        # Convert key character to shift value (A=0, B=1, ..., Z=25)
-        shift = ord(key_char) - ord('A')
-        
-        # For decryption, shift in the opposite direction
-        # This is equivalent to shifting by (26 - shift) % 26
-        result += caesar_shift(ciphertext[i], (26 - shift) % 26)
-    
-    return result
+    # For decryption, shift every letter in the opposite direction
+    with stage("decrypt.shift", ciphertext_codes.size):
+        return from_codes(decrypt_codes(ciphertext_codes, key_codes))